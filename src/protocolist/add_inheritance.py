@@ -131,36 +131,30 @@ def add_inheritance(
             f"{'\n'.join(applicable_interfaces.values())}\n"
             f"{updated_file_content}\n{class_name}()",
         )
-        exceptions = get_mypy_exceptions(config.mypy_folder, inheritance_code)
-        if any(
-            map(
-                re.compile(
-                    rf"Cannot instantiate abstract class \"{class_name}\" with abstract attribute"  # noqa: E501
-                ).search,
-                exceptions,
-            )
+        exceptions = get_mypy_exceptions(config, inheritance_code)
+        if exceptions.search(
+            re.compile(
+                rf"Cannot instantiate abstract class \"{class_name}\" with abstract attribute"  # noqa: E501
+            ),
+            "abstract",
         ):
             continue
         if any(
-            any(
-                map(
-                    re.compile(
-                        rf"Incompatible types in assignment \(expression has type \"[^\"]+\", base class \"{name}\""  # noqa: E501
-                    ).search,
-                    exceptions,
-                )
+            exceptions.search(
+                re.compile(
+                    rf"Incompatible types in assignment \(expression has type \"[^\"]+\", base class \"{name}\""  # noqa: E501
+                ),
+                "assignment",
             )
             for name in applicable_interfaces.keys()
         ):
             continue
         if any(
-            any(
-                map(
-                    re.compile(
-                        rf"Signature of \"[^\"]+\" incompatible with supertype \"{name}\""  # noqa: E501
-                    ).search,
-                    exceptions,
-                )
+            exceptions.search(
+                re.compile(
+                    rf"Signature of \"[^\"]+\" incompatible with supertype \"{name}\""  # noqa: E501
+                ),
+                "override",
             )
             for name in applicable_interfaces.keys()
         ):
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import os
+
+from ..config import Config
+from .checkers import Checker
+from .checkers import Checkers
+
+_checkers: dict[tuple, Checker] = {}
+
+
+def get_checker(config: Config) -> Checker:
+    key = (os.getpid(), config.checker_option, config.mypy_folder)
+    if key not in _checkers:
+        _checkers[key] = next(
+            subclass(config)
+            for subclass in Checkers
+            if subclass.type == config.checker_option
+        )
+    return _checkers[key]
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class CheckerOption(str, Enum):
+    API = "api"
+    DAEMON = "daemon"
+    BUILD = "build"
+    POOL = "pool"
+    SERVICE = "service"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import sys
+from multiprocessing import get_context
+from multiprocessing.connection import Listener
+
+from ..config import Config
+from ..consts import import_statement
+from .checker_factory import get_checker
+from .checker_option import CheckerOption
+
+
+def serve(config: Config, address: str) -> None:
+    """Answers probe requests on ``address`` with ``n_checkers`` processes.
+
+    The checkers are forked once mypy is imported and warm, and take turns
+    accepting connections, so any number of clients share a bounded set of
+    them. A request is ``(request_id, codes, strict, cwd, mypy_path)`` and
+    is answered with ``(request_id, exceptions)``, the exceptions being
+    those of ``BuildChecker`` or the error it raised. The socket lives in a
+    folder only its owner can access, so no authentication is done.
+    """
+    config = config.model_copy(update=dict(checker_option=CheckerOption.BUILD))
+    listener = Listener(address, family="AF_UNIX")
+    get_checker(config).check(import_statement)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    processes = tuple(
+        get_context("fork").Process(
+            target=_serve, args=(listener, config), daemon=True
+        )
+        for _ in range(max(config.n_checkers, 1))
+    )
+    try:
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    finally:
+        listener.close()
+
+
+def _serve(listener: Listener, config: Config) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    checker = get_checker(config)
+    while True:
+        with listener.accept() as connection:
+            request_id, codes, strict, cwd, mypy_path = connection.recv()
+            os.chdir(cwd)
+            if mypy_path is None:
+                os.environ.pop("MYPYPATH", None)
+            else:
+                os.environ["MYPYPATH"] = mypy_path
+            try:
+                result = checker.check_many(codes, strict)
+            except Exception as error:
+                result = error
+            connection.send((request_id, result))
+
+
+if __name__ == "__main__":
+    serve(Config(**json.loads(sys.stdin.read())), sys.argv[1])
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Sequence
+from uuid import uuid4
+
+import mypy.api
+
+from ..checker_option import CheckerOption
+from ..mypy_exception import MypyExceptions
+from .checker import Checker
+
+
+class ApiChecker(Checker):
+    type = CheckerOption.API
+
+    def check_many(
+        self, codes: Sequence[str], strict: bool = True
+    ) -> list[MypyExceptions]:
+        file_paths = tuple(
+            self.config.mypy_folder.joinpath(str(uuid4())).with_suffix(".py")
+            for _ in codes
+        )
+        for file_path, code in zip(file_paths, codes):
+            file_path.write_text(code)
+        try:
+            return self._parse_output(
+                mypy.api.run(
+                    list(map(str, file_paths))
+                    + self._get_flags(strict)
+                    + self._get_cache_flags(strict)
+                )[0],
+                file_paths,
+            )
+        finally:
+            for file_path in file_paths:
+                os.remove(file_path)
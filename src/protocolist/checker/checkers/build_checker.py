@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from copy import deepcopy
+
+from mypy import build
+from mypy.errors import CompileError
+from mypy.main import process_options
+from mypy.modulefinder import BuildSource
+from mypy.options import Options
+
+from ...config import Config
+from ..checker_option import CheckerOption
+from ..mypy_exception import MypyExceptions
+from .checker import Checker
+
+
+class BuildChecker(Checker):
+    """Feeds probe code straight into ``mypy.build.build``.
+
+    Probes are passed as text under stable module names, so nothing is
+    written to disk per probe and dependencies such as typeshed are read
+    from mypy's incremental cache. The paths only label mypy's messages.
+    """
+
+    type = CheckerOption.BUILD
+
+    def __init__(self, config: Config):
+        super().__init__(config)
+        self._options: dict[bool, Options] = {}
+
+    def check_many(
+        self, codes: Sequence[str], strict: bool = True
+    ) -> list[MypyExceptions]:
+        file_paths = tuple(
+            self.config.mypy_folder / f"protocolist_probe_{index}.py"
+            for index in range(len(codes))
+        )
+        sources = list(
+            BuildSource(str(file_path), file_path.with_suffix("").name, code)
+            for file_path, code in zip(file_paths, codes)
+        )
+        try:
+            messages = build.build(sources, self._get_options(strict)).errors
+        except CompileError as error:
+            messages = error.messages
+        return self._parse_output("\n".join(messages), file_paths)
+
+    def _get_options(self, strict: bool) -> Options:
+        if strict not in self._options:
+            _, self._options[strict] = process_options(
+                self._get_flags(strict)
+                + self._get_cache_flags(strict)
+                + ["-c", "pass"]
+            )
+        return deepcopy(self._options[strict])
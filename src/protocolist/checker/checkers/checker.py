@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Sequence
+from pathlib import Path
+
+import mypy.api
+
+from ...config import Config
+from ...consts import import_statement
+from ..checker_option import CheckerOption
+from ..mypy_cache import clear_overlay_cache_dirs
+from ..mypy_cache import get_overlay_cache_dir
+from ..mypy_cache import get_shared_cache_dir
+from ..mypy_exception import MypyException
+from ..mypy_exception import MypyExceptions
+
+
+class Checker(ABC):
+    type: CheckerOption
+
+    def __init__(self, config: Config):
+        self.config = config
+
+    def check(self, code: str, strict: bool = True) -> MypyExceptions:
+        return self.check_many([code], strict)[0]
+
+    @abstractmethod
+    def check_many(
+        self, codes: Sequence[str], strict: bool = True
+    ) -> list[MypyExceptions]:
+        """Checks all codes in one mypy build, one module per code."""
+
+    def close(self) -> None:
+        pass
+
+    def warm_up(self) -> None:
+        """Fills the shared mypy cache with what every probe imports."""
+        if not self.config.shared_mypy_cache:
+            return
+        clear_overlay_cache_dirs(self.config)
+        header = self.config.mypy_folder / "protocolist_header.py"
+        header.write_text(import_statement)
+        try:
+            for strict in (True, False):
+                mypy.api.run(
+                    [
+                        str(header),
+                        *self._get_flags(strict),
+                        "--cache-dir",
+                        str(get_shared_cache_dir(self.config, strict)),
+                    ]
+                )
+        finally:
+            os.remove(header)
+
+    def _get_cache_flags(self, strict: bool, slot: int = 0) -> list[str]:
+        if not self.config.shared_mypy_cache:
+            return []
+        return [
+            "--cache-dir",
+            str(get_overlay_cache_dir(self.config, strict, slot)),
+        ]
+
+    @staticmethod
+    def _get_flags(strict: bool) -> list[str]:
+        return ["--output", "json"] + (["--strict"] if strict else [])
+
+    @staticmethod
+    def _parse_output(
+        output: str, file_paths: Sequence[Path]
+    ) -> list[MypyExceptions]:
+        """Splits mypy's json output by probe file.
+
+        Exceptions reported for other modules (e.g. imported project files)
+        are given to every probe, as if each probe was checked on its own.
+        """
+        name2index = {
+            file_path.name: index for index, file_path in enumerate(file_paths)
+        }
+        exceptions = [[] for _ in file_paths]
+        for line in output.splitlines():
+            if line.startswith("{"):
+                record = json.loads(line)
+                parsed = record["file"], MypyException.from_json(record)
+            else:
+                parsed = MypyException.from_text(line)
+            if parsed is None:
+                continue
+            path, exception = parsed
+            index = name2index.get(Path(path).name)
+            for probe_exceptions in (
+                exceptions if index is None else (exceptions[index],)
+            ):
+                probe_exceptions.append(exception)
+        return list(map(MypyExceptions, exceptions))
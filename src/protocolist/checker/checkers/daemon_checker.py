@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import atexit
+import os
+import shutil
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from tempfile import mkdtemp
+
+import mypy.api
+
+from ...config import Config
+from ..checker_option import CheckerOption
+from ..mypy_exception import MypyExceptions
+from .checker import Checker
+
+_IDLE_TIMEOUT = 600
+
+
+class DaemonChecker(Checker):
+    """Keeps one dmypy server per process warm for the whole run.
+
+    Probes are written to the same files, so the server only rechecks the
+    changed modules instead of reloading typeshed on each call. The files live
+    outside ``mypy_folder`` because the daemon silences errors of modules
+    found on the python path, which that folder may be part of.
+    """
+
+    type = CheckerOption.DAEMON
+
+    def __init__(self, config: Config):
+        super().__init__(config)
+        self._pid = os.getpid()
+        self._folder = Path(mkdtemp(prefix="protocolist_"))
+        self._status_file = self._folder / "dmypy.json"
+        self._mtime = int(time.time())
+        atexit.register(self.close)
+
+    def check_many(
+        self, codes: Sequence[str], strict: bool = True
+    ) -> list[MypyExceptions]:
+        file_paths = tuple(
+            self._folder / f"probe_{index}.py" for index in range(len(codes))
+        )
+        # dmypy compares whole-second mtimes before hashing, so two probes
+        # of equal length written within a second would look unchanged
+        self._mtime = max(self._mtime + 1, int(time.time()))
+        for file_path, code in zip(file_paths, codes):
+            file_path.write_text(code)
+            os.utime(file_path, (self._mtime, self._mtime))
+        return self._parse_output(
+            mypy.api.run_dmypy(
+                [
+                    "--status-file",
+                    str(self._status_file),
+                    "run",
+                    "--timeout",
+                    str(_IDLE_TIMEOUT),
+                    "--",
+                    *map(str, file_paths),
+                    *self._get_flags(strict),
+                    *self._get_cache_flags(strict),
+                ]
+            )[0],
+            file_paths,
+        )
+
+    def close(self) -> None:
+        if os.getpid() != self._pid:
+            return
+        if self._status_file.exists():
+            mypy.api.run_dmypy(
+                ["--status-file", str(self._status_file), "stop"]
+            )
+        shutil.rmtree(self._folder, ignore_errors=True)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from uuid import uuid4
+
+import mypy.api
+from more_itertools import divide
+
+from ..checker_option import CheckerOption
+from ..mypy_exception import MypyExceptions
+from .checker import Checker
+
+
+class PoolChecker(Checker):
+    """Splits the probes of each call over ``n_checkers`` mypy processes.
+
+    Every process checks its share in one build, so each probe gets the
+    exceptions it would get from ``ApiChecker``, in the order of the codes.
+    Plain subprocesses are used since the daemonic file workers cannot
+    start multiprocessing children. A call making a single share, e.g. one
+    of a single probe, is checked in-process instead, as starting a cold
+    interpreter would only add to its cost.
+    """
+
+    type = CheckerOption.POOL
+
+    def check_many(
+        self, codes: Sequence[str], strict: bool = True
+    ) -> list[MypyExceptions]:
+        file_paths = tuple(
+            self.config.mypy_folder.joinpath(str(uuid4())).with_suffix(".py")
+            for _ in codes
+        )
+        for file_path, code in zip(file_paths, codes):
+            file_path.write_text(code)
+        try:
+            shares = tuple(
+                filter(
+                    None,
+                    map(
+                        tuple,
+                        divide(
+                            max(self.config.n_checkers, 1), range(len(codes))
+                        ),
+                    ),
+                )
+            )
+            if len(shares) < 2:
+                outputs = tuple(
+                    self._run(
+                        tuple(map(file_paths.__getitem__, share)),
+                        strict,
+                        0,
+                        in_process=True,
+                    )
+                    for share in shares
+                )
+            else:
+                with ThreadPoolExecutor(len(shares)) as executor:
+                    outputs = tuple(
+                        executor.map(
+                            lambda slot, share: self._run(
+                                tuple(map(file_paths.__getitem__, share)),
+                                strict,
+                                slot,
+                            ),
+                            range(len(shares)),
+                            shares,
+                        )
+                    )
+            exceptions = [MypyExceptions()] * len(codes)
+            for share, output in zip(shares, outputs):
+                for index, probe_exceptions in zip(
+                    share,
+                    self._parse_output(
+                        output, tuple(map(file_paths.__getitem__, share))
+                    ),
+                ):
+                    exceptions[index] = probe_exceptions
+            return exceptions
+        finally:
+            for file_path in file_paths:
+                os.remove(file_path)
+
+    def _run(
+        self,
+        file_paths: Sequence[Path],
+        strict: bool,
+        slot: int,
+        in_process: bool = False,
+    ) -> str:
+        arguments = [
+            *map(str, file_paths),
+            *self._get_flags(strict),
+            *self._get_cache_flags(strict, slot),
+        ]
+        if in_process:
+            return mypy.api.run(arguments)[0]
+        return subprocess.run(
+            [sys.executable, "-m", "mypy", *arguments],
+            capture_output=True,
+            text=True,
+        ).stdout
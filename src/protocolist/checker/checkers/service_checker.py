@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from multiprocessing.connection import Client
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import Optional
+
+from more_itertools import divide
+
+from ...config import Config
+from ..checker_option import CheckerOption
+from ..mypy_exception import MypyExceptions
+from .checker import Checker
+
+_ADDRESS_VARIABLE = "PROTOCOLIST_CHECKER_SERVICE"
+_START_TIMEOUT = 60
+
+
+class ServiceChecker(Checker):
+    """Sends probes to a service of ``n_checkers`` pre-forked mypy workers.
+
+    The first process needing the service starts it and exports its address
+    to the environment, so the file workers it forks later, and any process
+    started with that variable, share the same warm checkers. The probes of
+    a call are split over the checkers like in ``PoolChecker``.
+    """
+
+    type = CheckerOption.SERVICE
+
+    def __init__(self, config: Config):
+        super().__init__(config)
+        self._pid = os.getpid()
+        self._process: Optional[subprocess.Popen] = None
+        self._folder: Optional[Path] = None
+        self._request_ids = count()
+
+    def warm_up(self) -> None:
+        super().warm_up()
+        self._get_address()
+
+    def check_many(
+        self, codes: Sequence[str], strict: bool = True
+    ) -> list[MypyExceptions]:
+        address = self._get_address()
+        shares = tuple(
+            filter(
+                None,
+                map(
+                    tuple,
+                    divide(max(self.config.n_checkers, 1), range(len(codes))),
+                ),
+            )
+        )
+        with ThreadPoolExecutor(len(shares) or 1) as executor:
+            outputs = tuple(
+                executor.map(
+                    lambda share: self._request(
+                        address,
+                        tuple(map(codes.__getitem__, share)),
+                        strict,
+                    ),
+                    shares,
+                )
+            )
+        exceptions = [MypyExceptions()] * len(codes)
+        for share, output in zip(shares, outputs):
+            for index, probe_exceptions in zip(share, output):
+                exceptions[index] = probe_exceptions
+        return exceptions
+
+    def close(self) -> None:
+        if os.getpid() != self._pid or self._process is None:
+            return
+        self._process.terminate()
+        self._process.wait()
+        self._process = None
+        shutil.rmtree(self._folder, ignore_errors=True)
+        os.environ.pop(_ADDRESS_VARIABLE, None)
+
+    def _get_address(self) -> str:
+        address = os.environ.get(_ADDRESS_VARIABLE)
+        if address is None:
+            self._folder = Path(mkdtemp(prefix="protocolist_"))
+            address = str(self._folder / "checker.sock")
+            self._process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "protocolist.checker.checker_service",
+                    address,
+                ],
+                stdin=subprocess.PIPE,
+                env=dict(
+                    os.environ,
+                    PYTHONPATH=os.pathsep.join(
+                        filter(
+                            None,
+                            (
+                                str(Path(__file__).parents[3]),
+                                os.environ.get("PYTHONPATH"),
+                            ),
+                        )
+                    ),
+                ),
+                text=True,
+            )
+            self._process.stdin.write(self.config.model_dump_json())
+            self._process.stdin.close()
+            atexit.register(self.close)
+            os.environ[_ADDRESS_VARIABLE] = address
+        return address
+
+    def _request(
+        self, address: str, codes: Sequence[str], strict: bool
+    ) -> list[MypyExceptions]:
+        request_id = (os.getpid(), next(self._request_ids))
+        deadline = time.monotonic() + _START_TIMEOUT
+        while True:
+            try:
+                connection = Client(address, family="AF_UNIX")
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        with connection:
+            connection.send(
+                (
+                    request_id,
+                    codes,
+                    strict,
+                    os.getcwd(),
+                    os.environ.get("MYPYPATH"),
+                )
+            )
+            response_id, result = connection.recv()
+        assert response_id == request_id
+        if isinstance(result, BaseException):
+            raise result
+        return result
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from uuid import uuid4
+
+from ..config import Config
+
+
+def get_shared_cache_dir(config: Config, strict: bool) -> Path:
+    return config.mypy_folder / "mypy_cache" / "shared" / _get_mode(strict)
+
+
+def get_overlay_cache_dir(config: Config, strict: bool, slot: int = 0) -> Path:
+    """Private cache of one process, or of one slot of a process.
+
+    It starts as a copy of the shared cache, so mypy only ever writes to
+    caches no other process reads.
+    """
+    overlay = _get_overlays_dir(config).joinpath(
+        f"{os.getpid()}_{slot}", _get_mode(strict)
+    )
+    if not overlay.exists():
+        shared = get_shared_cache_dir(config, strict)
+        temporary = overlay.with_name(f"{_get_mode(strict)}_{uuid4()}")
+        if shared.exists():
+            shutil.copytree(shared, temporary)
+        else:
+            temporary.mkdir(parents=True)
+        os.replace(temporary, overlay)
+    return overlay
+
+
+def clear_overlay_cache_dirs(config: Config) -> None:
+    shutil.rmtree(_get_overlays_dir(config), ignore_errors=True)
+
+
+def _get_overlays_dir(config: Config) -> Path:
+    return config.mypy_folder / "mypy_cache" / "overlays"
+
+
+def _get_mode(strict: bool) -> str:
+    return "strict" if strict else "default"
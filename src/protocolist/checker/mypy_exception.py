@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from functools import cached_property
+from itertools import chain
+from operator import attrgetter
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+from more_itertools import map_reduce
+
+_text_pattern = re.compile(
+    r"(?P<file>[^:]+):(?P<line>\d+)(?::\d+)?: "
+    r"(?P<severity>\w+): (?P<message>.*?)(?:  \[(?P<code>[\w-]+)\])?$"
+)
+_type_pattern = re.compile(r"\"([^\"]+)\"")
+
+
+class MypyException(NamedTuple):
+    line: int
+    severity: str
+    message: str
+    code: Optional[str] = None
+    hint: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"{self.line}: {self.severity}: {self.message}" + (
+            f"  [{self.code}]" if self.code else ""
+        )
+
+    @property
+    def types(self) -> tuple[str, ...]:
+        """Quoted names in the message, e.g. the operand types."""
+        return tuple(_type_pattern.findall(self.message))
+
+    @classmethod
+    def from_json(cls, record: dict[str, Any]) -> MypyException:
+        return cls(
+            record["line"],
+            record["severity"],
+            record["message"],
+            record.get("code"),
+            record.get("hint"),
+        )
+
+    @classmethod
+    def from_text(cls, line: str) -> Optional[tuple[str, MypyException]]:
+        """Parses lines mypy prints as text even with ``--output json``,
+        i.e. blocking errors such as syntax errors."""
+        match = _text_pattern.match(line)
+        if match is None:
+            return None
+        return match["file"], cls(
+            int(match["line"]),
+            match["severity"],
+            match["message"],
+            match["code"],
+        )
+
+
+class MypyExceptions(tuple[MypyException, ...]):
+    """Exceptions of one probe, looked up by their mypy error code."""
+
+    def __new__(cls, exceptions: Iterable[MypyException] = ()):
+        return super().__new__(cls, exceptions)
+
+    @cached_property
+    def by_code(self) -> dict[Optional[str], tuple[MypyException, ...]]:
+        return map_reduce(self, attrgetter("code"), reducefunc=tuple)
+
+    def get(self, *codes: str) -> tuple[MypyException, ...]:
+        return tuple(
+            chain.from_iterable(self.by_code.get(code, ()) for code in codes)
+        )
+
+    def search(self, pattern: re.Pattern, *codes: str) -> list[re.Match]:
+        return list(
+            filter(
+                None,
+                (
+                    pattern.search(exception.message)
+                    for exception in (self.get(*codes) if codes else self)
+                ),
+            )
+        )
+
+    def difference(self, *others: Iterable[MypyException]) -> MypyExceptions:
+        excluded = frozenset(chain.from_iterable(others))
+        return MypyExceptions(
+            exception for exception in self if exception not in excluded
+        )
+
+    def shift_lines(self, offset: int) -> MypyExceptions:
+        return MypyExceptions(
+            exception._replace(line=exception.line + offset)
+            for exception in self
+        )
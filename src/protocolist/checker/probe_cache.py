@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable
+from hashlib import sha256
+from typing import Optional
+
+import mypy.version
+
+from ..config import Config
+from ..get_dependency_digests import get_dependency_digests
+from ..get_source_digest import get_source_digest
+from ..run_statistics import run_statistics
+from .checkers import Checker
+from .mypy_exception import MypyException
+from .mypy_exception import MypyExceptions
+
+
+class ProbeCache:
+    """Maps probe code to the mypy exceptions it produced.
+
+    The key covers the code, the mypy, python and protocolist versions, the
+    checker flags and the content of every project module the probe imports,
+    directly or transitively, so edits to e.g. the interfaces file
+    invalidate the entries depending on it. A bounded in-memory LRU sits in
+    front of an optional sqlite store kept in ``mypy_folder``.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._memory: OrderedDict[str, MypyExceptions] = OrderedDict()
+        self._connection = None
+        if config.persistent_probe_cache:
+            self._connection = sqlite3.connect(
+                config.mypy_folder / "probe_cache.sqlite3", timeout=60
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS probes "
+                "(key TEXT PRIMARY KEY, exceptions TEXT NOT NULL)"
+            )
+
+    def get_key(self, code: str, strict: bool) -> str:
+        return sha256(
+            "\0".join(
+                (
+                    mypy.version.__version__,
+                    sys.version,
+                    get_source_digest(),
+                    self.config.checker_option.value,
+                    *Checker._get_flags(strict),
+                    *(("stubs",) if self.config.stub_snapshot else ()),
+                    code,
+                    *get_dependency_digests(code),
+                )
+            ).encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[MypyExceptions]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            run_statistics["probe_cache.memory_hit"] += 1
+            return self._memory[key]
+        if self._connection is not None:
+            row = self._connection.execute(
+                "SELECT exceptions FROM probes WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                exceptions = MypyExceptions(
+                    MypyException(*exception)
+                    for exception in json.loads(row[0])
+                )
+                self._remember(key, exceptions)
+                run_statistics["probe_cache.disk_hit"] += 1
+                return exceptions
+        run_statistics["probe_cache.miss"] += 1
+        return None
+
+    def set(self, key: str, exceptions: Iterable[MypyException]) -> None:
+        exceptions = MypyExceptions(exceptions)
+        self._remember(key, exceptions)
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO probes VALUES (?, ?)",
+                    (key, json.dumps(exceptions)),
+                )
+
+    def _remember(self, key: str, exceptions: MypyExceptions) -> None:
+        if self.config.probe_cache_size <= 0:
+            return
+        self._memory[key] = exceptions
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.config.probe_cache_size:
+            self._memory.popitem(last=False)
+
+
+_probe_caches: dict[tuple, ProbeCache] = {}
+
+
+def get_probe_cache(config: Config) -> ProbeCache:
+    key = (os.getpid(), config.mypy_folder)
+    if key not in _probe_caches:
+        _probe_caches[key] = ProbeCache(config)
+    return _probe_caches[key]
@@ -14,6 +14,7 @@ from pydantic import BaseModel
 from pydantic import Field
 from pydantic_core import PydanticUndefined
 
+from .checker.checker_option import CheckerOption
 from .custom_argument_parser import CustomArgumentParser
 from .presentation_option.presentation_option import PresentationOption
 from .protocol_markers.mark_options import MarkOption
@@ -27,7 +28,7 @@ class Config(BaseModel):
     _root: Path = Path(__file__).parent
     project_root: Path = Path(os.getcwd())
     pos_args: list[str] = Field(default_factory=list)
-    mypy_folder: Path = _root / ".temp"
+    mypy_folder: Path
     config_file: Optional[Path] = None
     interfaces_path: Path
     interfaces_path_origin: Path
@@ -46,6 +47,15 @@ class Config(BaseModel):
     supports_getitem_option: Optional[SupportsGetitemOption] = None
     exclude_memoryview: bool = False
     tab_lengths: dict = Field(default_factory=dict)
+    checker_option: CheckerOption = CheckerOption.API
+    n_checkers: int = 2
+    probe_cache_size: int = 4096
+    persistent_probe_cache: bool = True
+    incremental: bool = False
+    function_memo: bool = True
+    probe_slicing: bool = False
+    stub_snapshot: bool = False
+    shared_mypy_cache: bool = True
 
     def __init__(self, /, **data: Any):
         data["interfaces_path"] = Path(
@@ -60,6 +70,13 @@ class Config(BaseModel):
         data["interfaces_path_origin"].mkdir(exist_ok=True)
         if not data["interfaces_path"].exists():
             data["interfaces_path"].write_text("")
+        data["mypy_folder"] = Path(
+            data.get(
+                "mypy_folder",
+                Path(data.get("project_root", os.getcwd())) / ".protocolist",
+            )
+        )
+        data["mypy_folder"].mkdir(parents=True, exist_ok=True)
         super().__init__(**data)
         self.excluded_libraries = frozenset(self.excluded_libraries).union(
             {"networkx.utils.configs"}
@@ -28,7 +28,7 @@ exception2method = dict(
     zip(
         (
             r"No overload variant of \"__getitem__\" of \"list\" matches argument type \"None\"",  # noqa: E501
-            r"Unsupported target for indexed assignment \(\"None\"\)\s+\[index\]",  # noqa: E501
+            r"Unsupported target for indexed assignment \(\"None\"\)",
             r"Value of type \"None\" is not indexable",
             r"has incompatible type \"None\"; expected \"Sized\"",
             r"No overload variant of \"iter\" matches argument type \"None\"",  # noqa: E501
@@ -88,6 +88,13 @@ exception2method = dict(
         ),
     )
 )
+exception2method_codes = (
+    "arg-type",
+    "attr-defined",
+    "call-overload",
+    "index",
+    "operator",
+)
 abc_classes = [
     ("Container", [], ["__contains__"]),
     ("Hashable", [], ["__hash__"]),
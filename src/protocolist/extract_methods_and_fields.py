@@ -3,11 +3,10 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-from .consts import abc_classes
-from .consts import builtin_types
 from .consts import protocol_replacement_name
 from .fields_methods_extractor import FieldsAndMethodsExtractor
 from .import2path import import2path
+from .interface_lattice import interface_lattice
 from .transform.class_extractor import GlobalClassExtractor
 from .utils.is_import_valid import is_import_valid
 
@@ -34,17 +33,10 @@ def extract_method_names_and_field_names(
     bases = set(bases).difference([protocol_replacement_name])
     classes = class_extractor.get(file_path).classes
     imports = class_extractor.get(file_path).imports
-    _builtin_types = {item[0]: item for item in builtin_types}
     tuple(
-        method_names.update(_builtin_types[base][-1])
+        method_names.update(interface_lattice.methods[base])
         for base in bases
-        if base in _builtin_types
-    )
-    _abc_classes = {item[0]: item for item in abc_classes}
-    tuple(
-        method_names.update(_abc_classes[base][-1])
-        for base in bases
-        if base in _abc_classes
+        if base in interface_lattice.methods
     )
     tuple(
         tuple(
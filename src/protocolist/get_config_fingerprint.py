@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from hashlib import sha256
+
+import mypy.version
+
+from .config import Config
+from .get_source_digest import get_source_digest
+
+_run_only_fields = frozenset(
+    (
+        "pos_args",
+        "mypy_folder",
+        "tab_length",
+        "tab_lengths",
+        "n_workers",
+        "checker_option",
+        "n_checkers",
+        "probe_cache_size",
+        "persistent_probe_cache",
+        "incremental",
+        "function_memo",
+        "shared_mypy_cache",
+    )
+)
+
+
+def get_config_fingerprint(config: Config) -> str:
+    """Digest of the mypy and protocolist versions and inference options."""
+    fields = config.model_dump(exclude=_run_only_fields)
+    return sha256(
+        json.dumps(
+            [
+                mypy.version.__version__,
+                get_source_digest(),
+                {
+                    name: (
+                        sorted(value)
+                        if isinstance(value, (set, frozenset))
+                        else value
+                    )
+                    for name, value in fields.items()
+                },
+            ],
+            default=str,
+            sort_keys=True,
+        ).encode()
+    ).hexdigest()
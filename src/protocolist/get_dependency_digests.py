@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Collection
+from collections.abc import Iterable
+from hashlib import sha256
+from pathlib import Path
+
+from .import2path import import2path
+
+_import_pattern = re.compile(
+    r"^\s*(?:from\s+([\w.]+)\s+import|import\s+([\w.]+))", re.MULTILINE
+)
+_file_digests: dict[str, tuple[tuple[int, int], str, tuple[str, ...]]] = {}
+
+
+def get_dependency_digests(
+    code: str, excluded_paths: Collection[Path] = ()
+) -> list[str]:
+    """Digests of the project modules ``code`` imports, transitively.
+
+    Files are re-read only when their mtime or size changed.
+    """
+    excluded_paths = frozenset(map(Path.absolute, excluded_paths))
+    digests = []
+    visited = set()
+    modules = list(get_imported_modules(code))
+    while modules:
+        module = modules.pop()
+        if module in visited:
+            continue
+        visited.add(module)
+        path = import2path(module)
+        if path in excluded_paths:
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = _file_digests.get(str(path))
+        if cached is None or cached[0] != signature:
+            content = path.read_text()
+            cached = (
+                signature,
+                sha256(content.encode()).hexdigest(),
+                tuple(get_imported_modules(content)),
+            )
+            _file_digests[str(path)] = cached
+        _, digest, imported_modules = cached
+        digests.append(f"{module}:{digest}")
+        modules.extend(imported_modules)
+    return sorted(digests)
+
+
+def get_imported_modules(code: str) -> Iterable[str]:
+    return (
+        from_module or module
+        for from_module, module in _import_pattern.findall(code)
+    )
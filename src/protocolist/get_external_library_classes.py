@@ -8,13 +8,11 @@ from dataclasses import dataclass
 from functools import lru_cache
 from importlib import import_module
 from importlib.metadata import packages_distributions
-from itertools import chain
 from types import ModuleType
 from typing import Any
 from typing import Optional
 
-from .consts import abc_classes
-from .consts import builtin_types
+from .interface_lattice import interface_lattice
 
 
 @dataclass(slots=True)
@@ -37,13 +35,10 @@ class ExternalLibElement:
         self.fields = dir(self.item)
         if self.item.__hash__ is None:
             self.fields.remove("__hash__")
+        implemented = interface_lattice.get_implemented(self.fields)
         self.superclasses = frozenset(
-            chain.from_iterable(
-                (interface, *superclasses)
-                for interface, superclasses, interface_methods in (
-                    abc_classes + builtin_types
-                )
-                if all(map(self.fields.__contains__, interface_methods))
+            interface_lattice.get_names(
+                implemented | interface_lattice.get_superclasses(implemented)
             )
         )
 
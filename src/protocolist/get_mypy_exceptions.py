@@ -1,23 +1,40 @@
 from __future__ import annotations
 
-import os
-from pathlib import Path
-from uuid import uuid4
+from collections.abc import Sequence
 
-import mypy.api
+from .checker.checker_factory import get_checker
+from .checker.mypy_exception import MypyExceptions
+from .checker.probe_cache import get_probe_cache
+from .config import Config
 
 
 def get_mypy_exceptions(
-    mypy_folder: Path, updated_code: str, strict: bool = True
-) -> list[str]:
-    file_path = mypy_folder.joinpath(str(uuid4())).with_suffix(".py")
-    file_path.write_text(updated_code)
-    try:
-        return list(
-            line.partition(":")[-1]
-            for line in mypy.api.run(
-                [str(file_path)] + ["--strict"] if strict else []
-            )[0].splitlines()[:-1]
-        )
-    finally:
-        os.remove(file_path)
+    config: Config, updated_code: str, strict: bool = True
+) -> MypyExceptions:
+    return get_many_mypy_exceptions(config, [updated_code], strict)[0]
+
+
+def get_many_mypy_exceptions(
+    config: Config, updated_codes: Sequence[str], strict: bool = True
+) -> list[MypyExceptions]:
+    probe_cache = get_probe_cache(config)
+    keys = tuple(
+        probe_cache.get_key(updated_code, strict)
+        for updated_code in updated_codes
+    )
+    exceptions = list(map(probe_cache.get, keys))
+    missing = tuple(
+        index
+        for index, probe_exceptions in enumerate(exceptions)
+        if probe_exceptions is None
+    )
+    if missing:
+        for index, probe_exceptions in zip(
+            missing,
+            get_checker(config).check_many(
+                tuple(updated_codes[index] for index in missing), strict
+            ),
+        ):
+            probe_cache.set(keys[index], probe_exceptions)
+            exceptions[index] = probe_exceptions
+    return exceptions
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+
+_package_root = Path(__file__).parent
+
+
+@lru_cache(maxsize=1)
+def get_source_digest() -> str:
+    """Digest of every source file of the package.
+
+    Stored results are keyed to it, so they are not reused by a protocolist
+    inferring differently, whether released or edited in place.
+    """
+    digest = sha256()
+    for path in sorted(_package_root.rglob("*.py")):
+        digest.update(str(path.relative_to(_package_root)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
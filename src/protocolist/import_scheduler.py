@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from itertools import chain
+from itertools import filterfalse
+from pathlib import Path
+from threading import Condition
+from typing import Optional
+
+
+class ImportScheduler:
+    """Starts the files of a batch once every batch it imports finished.
+
+    ``start`` is called with each released file and either returns whether
+    the file was modified, finishing it at once, or ``None`` if ``complete``
+    or ``fail`` will be called for it later, e.g. by pool callbacks. Errors
+    raised while releasing from a callback are kept like the ones passed to
+    ``fail``, since the pool thread running it would die with them.
+    """
+
+    def __init__(
+        self,
+        batches: Sequence[Sequence[Path]],
+        dependents: Mapping[int, Iterable[int]],
+        start: Callable[[Path], Optional[int]],
+    ):
+        self.batches = batches
+        self.dependents = dependents
+        self.start = start
+        self.finished = Condition()
+        self.results: dict[Path, int] = {}
+        self.errors: list[BaseException] = []
+        self._path2batch = {
+            path: index
+            for index, batch in enumerate(batches)
+            for path in batch
+        }
+        self._remaining = Counter(self._path2batch.values())
+        self._in_degree = Counter(chain.from_iterable(dependents.values()))
+
+    def run(self) -> dict[Path, int]:
+        with self.finished:
+            self._release(
+                filterfalse(
+                    self._in_degree.__getitem__, range(len(self.batches))
+                )
+            )
+            self.finished.wait_for(
+                lambda: self.errors
+                or len(self.results) == len(self._path2batch)
+            )
+        if self.errors:
+            raise self.errors[0]
+        return self.results
+
+    def complete(self, path: Path, is_modified: int) -> None:
+        with self.finished:
+            try:
+                self._release(self._complete(path, is_modified))
+            except BaseException as error:
+                self.errors.append(error)
+            self.finished.notify()
+
+    def fail(self, error: BaseException) -> None:
+        with self.finished:
+            self.errors.append(error)
+            self.finished.notify()
+
+    def _release(self, ready: Iterable[int]) -> None:
+        ready = list(ready)
+        while ready:
+            for path in self.batches[ready.pop()]:
+                is_modified = self.start(path)
+                if is_modified is not None:
+                    ready.extend(self._complete(path, is_modified))
+
+    def _complete(self, path: Path, is_modified: int) -> list[int]:
+        self.results[path] = is_modified
+        batch = self._path2batch[path]
+        self._remaining[batch] -= 1
+        if self._remaining[batch]:
+            return []
+        for dependent in self.dependents.get(batch, ()):
+            self._in_degree[dependent] -= 1
+        return list(
+            filterfalse(
+                self._in_degree.__getitem__, self.dependents.get(batch, ())
+            )
+        )
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import reduce
+from itertools import chain
+from operator import or_
+
+from .consts import abc_classes
+from .consts import builtin_types
+
+
+class InterfaceLattice:
+    """Interfaces given as ``(name, superclasses, methods)`` as bitsets.
+
+    Every method gets a bit, so the methods of an interface are an integer,
+    and every type name gets a bit, the names only listed as superclasses
+    included, so sets of types are integers too. The superclasses of an
+    interface are the ones it declares, which the tables already list
+    transitively for the interfaces they define.
+    """
+
+    def __init__(
+        self, interfaces: Iterable[tuple[str, Iterable[str], Iterable[str]]]
+    ):
+        interfaces = tuple(interfaces)
+        self.methods = {
+            name: tuple(methods) for name, _, methods in interfaces
+        }
+        self._type_names = tuple(
+            dict.fromkeys(
+                chain(
+                    self.methods,
+                    chain.from_iterable(
+                        superclasses for _, superclasses, _ in interfaces
+                    ),
+                )
+            )
+        )
+        self._type_ids = {
+            name: 1 << index for index, name in enumerate(self._type_names)
+        }
+        self._method_ids = {
+            method: 1 << index
+            for index, method in enumerate(
+                dict.fromkeys(chain.from_iterable(self.methods.values()))
+            )
+        }
+        self._interfaces = self.get_mask(self.methods)
+        self._method_masks = {
+            name: self._get_method_mask(methods)
+            for name, methods in self.methods.items()
+        }
+        self._superclass_masks = {
+            name: self.get_mask(superclasses)
+            for name, superclasses, _ in interfaces
+        }
+        self._subclass_masks = {
+            name: self.get_mask(
+                interface
+                for interface, superclasses in self._superclass_masks.items()
+                if superclasses & type_id
+            )
+            for name, type_id in self._type_ids.items()
+        }
+        self._providers = {
+            method: self.get_mask(
+                name
+                for name, methods in self._method_masks.items()
+                if methods & method_id
+            )
+            for method, method_id in self._method_ids.items()
+        }
+
+    def __contains__(self, name: str) -> bool:
+        """Whether ``name`` is an interface or a superclass of one."""
+        return name in self._type_ids
+
+    def get_mask(self, names: Iterable[str]) -> int:
+        """The known type ``names`` as a bitset, the unknown ones dropped."""
+        return reduce(or_, (self._type_ids.get(name, 0) for name in names), 0)
+
+    def get_names(self, mask: int) -> tuple[str, ...]:
+        return tuple(
+            name for name, type_id in self._type_ids.items() if mask & type_id
+        )
+
+    def get_providers(self, methods: Iterable[str]) -> int:
+        """The interfaces having every one of ``methods``."""
+        return reduce(
+            lambda mask, method: mask & self._providers.get(method, 0),
+            methods,
+            self._interfaces,
+        )
+
+    def get_implemented(self, methods: Iterable[str]) -> int:
+        """The interfaces whose methods are all among ``methods``."""
+        missing = ~self._get_method_mask(methods)
+        return self.get_mask(
+            name
+            for name, interface_methods in self._method_masks.items()
+            if not interface_methods & missing
+        )
+
+    def get_most_specific(self, mask: int) -> int:
+        """The interfaces of ``mask`` having no superclass in ``mask``."""
+        return self.get_mask(
+            name
+            for name in self.get_names(mask & self._interfaces)
+            if not self._superclass_masks[name] & mask
+        )
+
+    def get_superclasses(self, mask: int) -> int:
+        return reduce(
+            or_,
+            map(
+                self._superclass_masks.get,
+                self.get_names(mask & self._interfaces),
+            ),
+            0,
+        )
+
+    def get_subclasses(self, mask: int) -> int:
+        return reduce(
+            or_, map(self._subclass_masks.get, self.get_names(mask)), 0
+        )
+
+    def has_superclasses(self, interface: str, names: Iterable[str]) -> bool:
+        """Whether ``interface`` declares every one of ``names``."""
+        names = tuple(names)
+        return all(map(self._type_ids.__contains__, names)) and not (
+            self.get_mask(names) & ~self._superclass_masks[interface]
+        )
+
+    def _get_method_mask(self, methods: Iterable[str]) -> int:
+        return reduce(
+            or_, (self._method_ids.get(method, 0) for method in methods), 0
+        )
+
+
+interface_lattice = InterfaceLattice(abc_classes + builtin_types)
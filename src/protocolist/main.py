@@ -2,28 +2,38 @@ from __future__ import annotations
 
 import os
 import re
+from collections import Counter
+from functools import partial
+from itertools import chain
 from itertools import compress
-from itertools import filterfalse
 from multiprocessing import Manager
 from multiprocessing import Pool
 from operator import itemgetter
 from pathlib import Path
+from typing import Optional
 
 from .add_inheritance import add_inheritance
+from .checker.checker_factory import get_checker
 from .config import Config
 from .config import create_config_with_args
 from .config import parse_arguments
+from .import_scheduler import ImportScheduler
+from .manifest import Manifest
 from .presentation_option.protocol_saver_factory import create_protocol_saver
 from .protocol_dict import ProtocolDict
 from .protocol_markers.types_marker_factory import create_type_marker
 from .remove_star_imports import remove_star_imports
+from .run_statistics import run_statistics
+from .sort_paths_by_import_links import batch_paths_by_import_links
+from .sort_paths_by_import_links import link_batches_by_import_links
 from .sort_paths_by_import_links import link_files_by_imports
-from .sort_paths_by_import_links import sort_paths_by_import_links
+from .stub_snapshot import StubSnapshot
 from .transaction import transation
 from .transform.class_extractor import ClassExtractor
 from .transform.class_extractor import GlobalClassExtractor
+from .transform.create_protocols import count_definitions
 from .transform.create_protocols import create_protocols
-from .utils.lock import lock
+from .transform.create_protocols import prefetch_protocols
 
 
 def main() -> int:
@@ -43,8 +53,10 @@ def protocol(config: Config) -> int:
         )
     )
     global_class_extractor = GlobalClassExtractor(config)
+    manifest = Manifest(config)
     import_links = link_files_by_imports(paths, global_class_extractor)
-    paths = sort_paths_by_import_links(paths, import_links)
+    batches = batch_paths_by_import_links(paths, import_links)
+    paths = tuple(chain.from_iterable(batches))
     classes = ClassExtractor(
         config, create_type_marker(config)
     ).extract_classes(config.interfaces_path.read_text())
@@ -61,60 +73,41 @@ def protocol(config: Config) -> int:
             key=itemgetter(1),
         )
     )
-    if config.n_workers > 1:
-        is_file_modified = {}
+    get_checker(config).warm_up()
+    with StubSnapshot(config).activate(paths):
+        if config.n_workers > 1:
+            unprefetched = {}
 
-        def task_done_callback(result: tuple[int, Path]):
-            nonlocal import_links
-            is_modified, path = result
-            is_file_modified[path] = is_modified
-
-            with lock:
-                import_links = tuple(
-                    filter(lambda link: link.from_import != path, import_links)
+            def start(path: Path) -> Optional[int]:
+                if manifest.is_unchanged(path):
+                    return 0
+                n_definitions = (
+                    count_definitions(path.read_text())
+                    if config.function_memo
+                    else 0
                 )
-                new_executing = list(
-                    filterfalse(
-                        executing.__contains__,
-                        filterfalse(
-                            tuple(
-                                link.to_import for link in import_links
-                            ).__contains__,
-                            paths,
-                        ),
-                    )
-                )
-                executing.extend(new_executing)
-            with Pool(processes=config.n_workers) as pool:
-                for path in new_executing:
+                if n_definitions < 2:
+                    submit(path)
+                    return None
+                unprefetched[path] = n_definitions
+                for definition in range(n_definitions):
                     pool.apply_async(
-                        create_protocols,
+                        _prefetch_protocols_in_worker,
                         kwds=dict(
                             filepath=path,
                             config=config,
-                            protocols=protocols,
+                            protocols=protocols.copy(),
                             class_extractor=global_class_extractor,
+                            definition=definition,
                         ),
-                        callback=task_done_callback,
-                        error_callback=error_callback,
+                        callback=partial(prefetch_done_callback, path),
+                        error_callback=scheduler.fail,
                     )
-                pool.close()
-                pool.join()
+                return None
 
-        with Pool(processes=config.n_workers) as pool, Manager() as manager:
-            protocols = manager.dict()
-            protocols.update(interfaces)
-            executing = list(
-                filterfalse(
-                    tuple(
-                        link.to_import for link in import_links
-                    ).__contains__,
-                    paths,
-                )
-            )
-            for path in executing:
+            def submit(path: Path) -> None:
                 pool.apply_async(
-                    create_protocols,
+                    _create_protocols_in_worker,
                     kwds=dict(
                         filepath=path,
                         config=config,
@@ -122,28 +115,59 @@ def protocol(config: Config) -> int:
                         class_extractor=global_class_extractor,
                     ),
                     callback=task_done_callback,
-                    error_callback=error_callback,
+                    error_callback=scheduler.fail,
                 )
-            pool.close()
-            pool.join()
-        is_file_modified = tuple(map(is_file_modified.__getitem__, paths))
-    else:
-        protocols = ProtocolDict(int, **interfaces)
-        is_file_modified = tuple(
-            create_protocols(
-                filepath,
-                config=config,
-                protocols=protocols,
-                class_extractor=global_class_extractor,
-            )[0]
-            for filepath in paths
-        )
+
+            def task_done_callback(result: tuple[tuple[int, Path], Counter]):
+                (is_modified, path), statistics = result
+                run_statistics.update(statistics)
+                scheduler.complete(path, is_modified)
+
+            def prefetch_done_callback(path: Path, statistics: Counter):
+                with scheduler.finished:
+                    run_statistics.update(statistics)
+                    unprefetched[path] -= 1
+                    if not unprefetched[path]:
+                        submit(path)
+
+            scheduler = ImportScheduler(
+                batches,
+                link_batches_by_import_links(batches, import_links),
+                start,
+            )
+            with Pool(
+                processes=config.n_workers
+            ) as pool, Manager() as manager:
+                protocols = manager.dict()
+                protocols.update(interfaces)
+                is_file_modified = scheduler.run()
+            is_file_modified = tuple(map(is_file_modified.__getitem__, paths))
+        else:
+            protocols = ProtocolDict(int, **interfaces)
+            is_file_modified = tuple(
+                (
+                    0
+                    if manifest.is_unchanged(filepath)
+                    else create_protocols(
+                        filepath,
+                        config=config,
+                        protocols=protocols,
+                        class_extractor=global_class_extractor,
+                    )[0]
+                )
+                for filepath in paths
+            )
     create_protocol_saver(config).modify_protocols()
+    manifest.restore()
     is_file_modified = tuple(
-        add_inheritance(
-            filepath, config=config, class_extractor=global_class_extractor
+        (
+            modified
+            if filepath in manifest.skipped
+            else add_inheritance(
+                filepath, config=config, class_extractor=global_class_extractor
+            )
+            or modified
         )
-        or modified
         for filepath, modified in zip(paths, is_file_modified)
     )
     remove_star_imports(config)
@@ -159,8 +183,19 @@ def protocol(config: Config) -> int:
         f"reorder-python-imports "
         f"{str_path} {config.interfaces_path.absolute()} --py39-plus"
     )
+    manifest.record(paths)
+    if run_statistics:
+        print(run_statistics.report())
+        run_statistics.clear()
     return fail
 
 
-def error_callback(e: Exception):
-    raise e
+def _prefetch_protocols_in_worker(**kwargs) -> Counter:
+    prefetch_protocols(**kwargs)
+    return run_statistics.collect()
+
+
+def _create_protocols_in_worker(
+    **kwargs,
+) -> tuple[tuple[int, Path], Counter]:
+    return create_protocols(**kwargs), run_statistics.collect()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable
+from contextlib import suppress
+from hashlib import sha256
+from pathlib import Path
+
+import libcst
+import libcst.matchers as m
+from libcst import ClassDef
+from libcst import Import
+from libcst import ImportFrom
+from libcst import ImportStar
+from libcst import Module
+from libcst import SimpleStatementLine
+from libcst.helpers import get_full_name_for_node
+
+from .config import Config
+from .get_config_fingerprint import get_config_fingerprint
+from .get_dependency_digests import get_dependency_digests
+from .run_statistics import run_statistics
+
+_VERSION = 1
+
+
+class Manifest:
+    """Remembers every file as the last run left it.
+
+    A file whose content and project dependencies still match its record is
+    skipped, and the protocols it contributed are put back into the
+    interfaces file if they went missing since.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.path = config.project_root / ".protocolist" / "state"
+        self.skipped = set()
+        self._fingerprint = get_config_fingerprint(config)
+        self._files = {}
+        self._interface_imports = []
+        if config.incremental and self.path.exists():
+            with suppress(ValueError, KeyError):
+                state = json.loads(self.path.read_text())
+                if (state["version"], state["fingerprint"]) == (
+                    _VERSION,
+                    self._fingerprint,
+                ):
+                    self._files = state["files"]
+                    self._interface_imports = state["interface_imports"]
+
+    def is_unchanged(self, path: Path) -> bool:
+        if not self.config.incremental:
+            return False
+        record = self._files.get(self._get_key(path))
+        code = path.read_text()
+        unchanged = (
+            record is not None
+            and record["hash"] == _get_hash(code)
+            and record["dependencies"] == self._get_dependencies(code)
+        )
+        run_statistics["manifest.hit" if unchanged else "manifest.miss"] += 1
+        if unchanged:
+            self.skipped.add(path)
+        return unchanged
+
+    def restore(self) -> None:
+        if not self.skipped:
+            return
+        interface_code = self.config.interfaces_path.read_text()
+        classes = _get_classes(libcst.parse_module(interface_code))
+        missing = {
+            name: code
+            for path in self.skipped
+            for name, code in self._files[self._get_key(path)][
+                "protocols"
+            ].items()
+            if name not in classes
+        }
+        if not missing:
+            return
+        head, separator, tail = interface_code.partition("@runtime_checkable")
+        self.config.interfaces_path.write_text(
+            head
+            + "".join(
+                f"{line}\n"
+                for line in self._interface_imports
+                if line not in head
+            )
+            + separator
+            + tail
+            + "".join(f"\n{code}" for code in missing.values())
+        )
+
+    def record(self, paths: Iterable[Path]) -> None:
+        if not self.config.incremental:
+            return
+        module = libcst.parse_module(self.config.interfaces_path.read_text())
+        classes = _get_classes(module)
+        for path in paths:
+            code = path.read_text()
+            self._files[self._get_key(path)] = dict(
+                hash=_get_hash(code),
+                dependencies=self._get_dependencies(code),
+                protocols={
+                    name: classes[name]
+                    for name in self._get_protocol_names(code, classes)
+                },
+            )
+        self.path.parent.mkdir(exist_ok=True)
+        self.path.write_text(
+            json.dumps(
+                dict(
+                    version=_VERSION,
+                    fingerprint=self._fingerprint,
+                    interface_imports=list(
+                        module.code_for_node(statement).strip()
+                        for statement in module.body
+                        if isinstance(statement, SimpleStatementLine)
+                        and any(
+                            isinstance(element, (Import, ImportFrom))
+                            for element in statement.body
+                        )
+                    ),
+                    files=self._files,
+                )
+            )
+        )
+
+    def _get_key(self, path: Path) -> str:
+        path = path.absolute()
+        if path.is_relative_to(self.config.project_root):
+            return str(path.relative_to(self.config.project_root))
+        return str(path)
+
+    def _get_dependencies(self, code: str) -> list[str]:
+        return get_dependency_digests(code, (self.config.interfaces_path,))
+
+    def _get_protocol_names(
+        self, code: str, classes: dict[str, str]
+    ) -> set[str]:
+        names = set(
+            alias.evaluated_name
+            for statement in m.findall(
+                libcst.parse_module(code), m.ImportFrom()
+            )
+            if statement.module is not None
+            and get_full_name_for_node(statement.module)
+            == self.config.interface_import_path
+            and not isinstance(statement.names, ImportStar)
+            for alias in statement.names
+        ).intersection(classes)
+        unvisited = list(names)
+        while unvisited:
+            for name in frozenset(
+                re.findall(r"\w+", classes[unvisited.pop()])
+            ).intersection(classes):
+                if name not in names:
+                    names.add(name)
+                    unvisited.append(name)
+        return names
+
+
+def _get_classes(module: Module) -> dict[str, str]:
+    return {
+        statement.name.value: module.code_for_node(statement).strip()
+        for statement in module.body
+        if isinstance(statement, ClassDef)
+    }
+
+
+def _get_hash(content: str) -> str:
+    return sha256(content.encode()).hexdigest()
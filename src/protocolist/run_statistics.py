@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from collections import Counter
+from itertools import groupby
+
+
+class RunStatistics(Counter):
+    """Counters named ``<cache>.<outcome>``, e.g. ``probe_cache.miss``.
+
+    Outcomes ending with ``hit`` are counted as hits when reporting.
+    """
+
+    def collect(self) -> Counter:
+        collected = Counter(self)
+        self.clear()
+        return collected
+
+    def report(self) -> str:
+        lines = []
+        for name, items in groupby(
+            sorted(self.items()), key=lambda item: item[0].partition(".")[0]
+        ):
+            outcomes = {key.partition(".")[-1]: value for key, value in items}
+            total = sum(outcomes.values())
+            hits = sum(
+                value
+                for outcome, value in outcomes.items()
+                if outcome.endswith("hit")
+            )
+            details = ", ".join(
+                f"{outcome} {value}"
+                for outcome, value in sorted(outcomes.items())
+            )
+            lines.append(
+                f"{name}: {hits}/{total} hits"
+                f" ({hits / total if total else 0:.1%}) [{details}]"
+            )
+        return "\n".join(lines)
+
+
+run_statistics = RunStatistics()
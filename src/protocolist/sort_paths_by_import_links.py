@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import heapq
+import os
 from collections.abc import Collection
 from collections.abc import Iterable
 from collections.abc import Sequence
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from typing import NamedTuple
 
+from more_itertools import map_reduce
+
 from protocolist.convert_relative_to_absolute import convert_relative_path
 from protocolist.transform.class_extractor import GlobalClassExtractor
 
@@ -18,40 +24,160 @@ class _ImportLink(NamedTuple):
 def link_files_by_imports(
     paths: Sequence[Path], global_class_extractor: GlobalClassExtractor
 ) -> Sequence[_ImportLink]:
+    module2path = _get_module2path(paths)
     return tuple(
-        _ImportLink(import_path.absolute(), path.absolute())
+        _ImportLink(module2path[module], path.absolute())
         for path, extractor in zip(
             paths, map(global_class_extractor.get, paths)
         )
-        for import_path in map(
-            Path,
-            map(
-                lambda import_path: convert_relative_path(
-                    path, import_path
-                ).replace(".", "/")
-                + ".py",
-                extractor.imports.keys(),
-            ),
+        for module in map(
+            lambda import_path: convert_relative_path(path, import_path),
+            extractor.imports.keys(),
         )
-        if import_path.exists()
-        and (import_path in paths or import_path.absolute() in paths)
+        if module in module2path
     )
 
 
 def sort_paths_by_import_links(
     paths: Iterable[Path], import_links: Collection[_ImportLink]
 ) -> list[Path]:
-    paths_in_order = []
-    paths = list(paths)
-    while paths:
-        for path in tuple(map(Path.absolute, paths)):
-            if path not in tuple(link.to_import for link in import_links):
-                paths_in_order.append(path)
-                import_links = tuple(
-                    filter(lambda link: link.from_import != path, import_links)
-                )
-                paths.remove(path)
-                break
-        else:
-            raise ValueError
-    return paths_in_order
+    return list(
+        chain.from_iterable(batch_paths_by_import_links(paths, import_links))
+    )
+
+
+def batch_paths_by_import_links(
+    paths: Iterable[Path], import_links: Collection[_ImportLink]
+) -> list[tuple[Path, ...]]:
+    """Orders paths so every file comes after the files it imports.
+
+    Files importing each other are collapsed into one batch. Among the
+    batches ready to run, the one holding the earliest path comes first.
+    """
+    paths = tuple(dict.fromkeys(map(Path.absolute, paths)))
+    path2index = {path: index for index, path in enumerate(paths)}
+    imported_by = map_reduce(
+        (
+            link
+            for link in set(import_links)
+            if link.from_import in path2index and link.to_import in path2index
+        ),
+        lambda link: path2index[link.from_import],
+        lambda link: path2index[link.to_import],
+        set,
+    )
+    components = _get_strongly_connected_components(len(paths), imported_by)
+    index2component = {
+        index: component_index
+        for component_index, component in enumerate(components)
+        for index in component
+    }
+    component_links = map_reduce(
+        (
+            (index2component[index], index2component[dependent])
+            for index, dependents in imported_by.items()
+            for dependent in dependents
+            if index2component[index] != index2component[dependent]
+        ),
+        itemgetter(0),
+        itemgetter(1),
+        set,
+    )
+    in_degree = [0] * len(components)
+    for dependent in chain.from_iterable(component_links.values()):
+        in_degree[dependent] += 1
+    ready = [
+        (components[component_index][0], component_index)
+        for component_index, degree in enumerate(in_degree)
+        if not degree
+    ]
+    heapq.heapify(ready)
+    batches = []
+    while ready:
+        _, component_index = heapq.heappop(ready)
+        batches.append(
+            tuple(map(paths.__getitem__, components[component_index]))
+        )
+        for dependent in component_links.get(component_index, ()):
+            in_degree[dependent] -= 1
+            if not in_degree[dependent]:
+                heapq.heappush(ready, (components[dependent][0], dependent))
+    return batches
+
+
+def link_batches_by_import_links(
+    batches: Sequence[Sequence[Path]], import_links: Iterable[_ImportLink]
+) -> dict[int, set[int]]:
+    """Maps each batch index to the indices of the batches importing it."""
+    path2batch = {
+        path: index for index, batch in enumerate(batches) for path in batch
+    }
+    return map_reduce(
+        (
+            (path2batch[link.from_import], path2batch[link.to_import])
+            for link in import_links
+            if path2batch[link.from_import] != path2batch[link.to_import]
+        ),
+        itemgetter(0),
+        itemgetter(1),
+        set,
+    )
+
+
+def _get_strongly_connected_components(
+    n_nodes: int, edges: dict[int, Collection[int]]
+) -> list[tuple[int, ...]]:
+    """Iterative Tarjan, each component sorted by node index."""
+    indices = [-1] * n_nodes
+    low_links = [0] * n_nodes
+    on_stack = [False] * n_nodes
+    stack = []
+    components = []
+    counter = 0
+    for root in range(n_nodes):
+        if indices[root] != -1:
+            continue
+        work = [(root, iter(edges.get(root, ())))]
+        indices[root] = low_links[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if indices[successor] == -1:
+                    indices[successor] = low_links[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, iter(edges.get(successor, ()))))
+                    break
+                if on_stack[successor]:
+                    low_links[node] = min(low_links[node], indices[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low_links[parent] = min(low_links[parent], low_links[node])
+                if low_links[node] == indices[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(tuple(sorted(component)))
+    return components
+
+
+def _get_module2path(paths: Iterable[Path]) -> dict[str, Path]:
+    cwd = Path(os.getcwd())
+    module2path = {}
+    for path in map(Path.absolute, paths):
+        module2path[".".join(path.with_suffix("").parts)] = path
+        if path.is_relative_to(cwd):
+            module2path[
+                ".".join(path.relative_to(cwd).with_suffix("").parts)
+            ] = path
+    return module2path
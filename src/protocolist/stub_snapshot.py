@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import shutil
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextlib import suppress
+from pathlib import Path
+from uuid import uuid4
+
+import libcst
+import libcst.matchers as m
+from libcst import FunctionDef
+from libcst import ParserSyntaxError
+
+from .config import Config
+from .get_dependency_digests import get_imported_modules
+from .import2path import import2path
+from .transform.skeleton_transformer import SkeletonTransformer
+
+
+class StubSnapshot:
+    """Stubs of the project modules, found by mypy before their sources.
+
+    Probes importing a project module then only analyze its signatures. A
+    stub keeps module level statements and class bodies as they are and
+    elides the body of every function, except for methods assigning
+    attributes of their first parameter, since those declare attributes.
+    The interfaces file is left out, as it changes with every new protocol.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.folder = config.mypy_folder / "stubs"
+
+    @contextmanager
+    def activate(self, paths: Iterable[Path]) -> Iterator[None]:
+        if not self.config.stub_snapshot:
+            yield
+            return
+        shutil.rmtree(self.folder, ignore_errors=True)
+        self.refresh(self._get_project_modules(paths))
+        mypy_path = os.environ.get("MYPYPATH")
+        os.environ["MYPYPATH"] = os.pathsep.join(
+            filter(None, (str(self.folder), mypy_path))
+        )
+        try:
+            yield
+        finally:
+            if mypy_path is None:
+                del os.environ["MYPYPATH"]
+            else:
+                os.environ["MYPYPATH"] = mypy_path
+
+    def refresh(self, paths: Iterable[Path]) -> None:
+        if not self.config.stub_snapshot:
+            return
+        root = Path(os.getcwd())
+        for path in paths:
+            path = path.absolute()
+            if not path.is_relative_to(root) or path == (
+                self.config.interfaces_path.absolute()
+            ):
+                continue
+            stub_path = self.folder.joinpath(
+                path.relative_to(root)
+            ).with_suffix(".pyi")
+            stub_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = stub_path.with_name(f"{uuid4()}.tmp")
+            temporary_path.write_text(_get_stub(path.read_text()))
+            os.replace(temporary_path, stub_path)
+
+    def _get_project_modules(self, paths: Iterable[Path]) -> set[Path]:
+        root = Path(os.getcwd())
+        modules = set()
+        unvisited = list(map(Path.absolute, paths))
+        while unvisited:
+            path = unvisited.pop()
+            if path in modules or not path.is_file():
+                continue
+            modules.add(path)
+            unvisited.extend(
+                parent / "__init__.py"
+                for parent in path.parents
+                if parent.is_relative_to(root) and parent != root
+            )
+            unvisited.extend(
+                map(import2path, get_imported_modules(path.read_text()))
+            )
+        return modules
+
+
+class _StubTransformer(SkeletonTransformer):
+    def leave_FunctionDef(
+        self, original_node: "FunctionDef", updated_node: "FunctionDef"
+    ) -> "FunctionDef":
+        if _assigns_attributes(original_node):
+            return updated_node
+        return super().leave_FunctionDef(original_node, updated_node)
+
+
+def _assigns_attributes(function: FunctionDef) -> bool:
+    if not function.params.params:
+        return False
+    attribute = m.Attribute(value=m.Name(function.params.params[0].name.value))
+    return any(
+        m.findall(target.target, attribute)
+        for target in m.findall(
+            function.body, m.AssignTarget() | m.AnnAssign()
+        )
+    )
+
+
+def _get_stub(code: str) -> str:
+    with suppress(ParserSyntaxError):
+        return libcst.parse_module(code).visit(_StubTransformer()).code
+    return code
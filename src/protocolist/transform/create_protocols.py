@@ -2,18 +2,26 @@ from __future__ import annotations
 
 import collections
 import os
+import re
 import typing
 from pathlib import Path
 
 import libcst as cst
+import libcst.matchers as m
 
 from ..config import Config
 from ..extract_annotations import extract_annotations
+from ..protocol_dict import ProtocolDict
 from ..protocol_markers.types_marker_factory import create_type_marker
+from ..stub_snapshot import StubSnapshot
 from .class_extractor import ClassExtractor
 from .class_extractor import GlobalClassExtractor
 from .type_add_transformer import TypeAddTransformer
 
+_definition_pattern = re.compile(
+    r"^(?:async\s+def|def|class)\s", re.MULTILINE
+)
+
 
 def create_protocols(
     filepath: Path,
@@ -85,6 +93,49 @@ def create_protocols(
     ).replace("\t", config.tab_length * " ")
     if new_code != code:
         filepath.write_text(new_code)
+        StubSnapshot(config).refresh((filepath,))
         print(f"File {filepath} was modified")
         return 1, filepath
     return 0, filepath
+
+
+def count_definitions(code: str) -> int:
+    return len(_definition_pattern.findall(code))
+
+
+def prefetch_protocols(
+    filepath: Path,
+    config: Config,
+    protocols: dict,
+    class_extractor: GlobalClassExtractor,
+    definition: int,
+) -> None:
+    """Fills the function memo for one top level definition of a file.
+
+    A later ``create_protocols`` run then reuses whatever the other
+    definitions it processes first did not change.
+    """
+    module = cst.parse_module(filepath.read_text())
+    definitions = tuple(
+        statement
+        for statement in module.body
+        if isinstance(statement, (cst.FunctionDef, cst.ClassDef))
+    )
+    if definition >= len(definitions):
+        return
+    module.visit(
+        TypeAddTransformer(
+            config,
+            ProtocolDict(int, **protocols),
+            create_type_marker(config),
+            class_extractor,
+            filepath,
+            prefetch=frozenset(
+                function
+                for function in m.findall(
+                    definitions[definition], m.FunctionDef()
+                )
+                if not m.findall(function.body, m.FunctionDef())
+            ),
+        )
+    )
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from functools import lru_cache
+from hashlib import sha256
+from typing import Optional
+
+import libcst
+import libcst.matchers as m
+from libcst import ClassDef
+from libcst import FunctionDef
+from libcst import Module
+
+from ..config import Config
+from ..get_config_fingerprint import get_config_fingerprint
+from ..get_dependency_digests import get_dependency_digests
+from ..run_statistics import run_statistics
+from .skeleton_transformer import SkeletonTransformer
+
+_VERSION = "4"
+
+
+class FunctionMemo:
+    """Maps a function, as far as inference can see it, to its result.
+
+    The key covers the function source, the skeleton of its enclosing class,
+    the skeletons of the definitions of its file it references or which
+    mention it, the lines mentioning its name, the project modules the file
+    imports, the protocolist sources and the options affecting inference. A
+    record keeps the names of the run which produced it, along with how far
+    that run advanced each protocol counter, so a hit can be moved onto
+    freshly reserved names.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._fingerprint = get_config_fingerprint(config)
+        self._memory: dict[str, dict] = {}
+        self._connection = sqlite3.connect(
+            config.mypy_folder / "function_memo.sqlite3", timeout=60
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS functions "
+            "(key TEXT PRIMARY KEY, record TEXT NOT NULL)"
+        )
+
+    def get_key(
+        self,
+        function: FunctionDef,
+        class_: Optional[ClassDef],
+        definitions: Iterable[tuple[str, str]],
+        code: str,
+    ) -> str:
+        """``definitions`` pairs each top level definition name with its
+        code as the probes see it, i.e. with the inferred annotations."""
+        referenced = frozenset(
+            name.value for name in m.findall(function, m.Name())
+        )
+        mention = re.compile(rf"\b{function.name.value}\b")
+        return sha256(
+            "\0".join(
+                (
+                    _VERSION,
+                    self._fingerprint,
+                    Module([function]).code,
+                    (
+                        Module([class_.visit(SkeletonTransformer())]).code
+                        if class_ is not None
+                        else ""
+                    ),
+                    *(
+                        _get_skeleton(definition)
+                        for name, definition in definitions
+                        if name in referenced or mention.search(definition)
+                    ),
+                    *(
+                        line
+                        for line in code.splitlines()
+                        if mention.search(line)
+                    ),
+                    *get_dependency_digests(
+                        code, (self.config.interfaces_path,)
+                    ),
+                )
+            ).encode()
+        ).hexdigest()
+
+    def __contains__(self, key: str) -> bool:
+        return (
+            key in self._memory
+            or self._connection.execute(
+                "SELECT 1 FROM functions WHERE key = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        record = self._memory.get(key)
+        if record is None:
+            row = self._connection.execute(
+                "SELECT record FROM functions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                record = self._memory[key] = json.loads(row[0])
+        run_statistics[
+            "function_memo.miss" if record is None else "function_memo.hit"
+        ] += 1
+        return record
+
+    def set(self, key: str, record: dict) -> None:
+        self._memory[key] = record
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO functions VALUES (?, ?)",
+                (key, json.dumps(record)),
+            )
+
+
+def reserve_names(
+    record: dict, placeholders: Mapping[str, str], protocols: dict
+) -> Callable[[str], str]:
+    """Advances ``protocols`` as far as the run of ``record`` did.
+
+    Returns a function renaming the names of that run to the reserved ones
+    and the parameter placeholders to ``placeholders``.
+    """
+    names = {
+        record["placeholders"][param]: placeholder
+        for param, placeholder in placeholders.items()
+    }
+    for prefix, (base, count) in record["counters"].items():
+        start = protocols.get(prefix, 0)
+        protocols[prefix] = start + count
+        names.update(
+            (f"{prefix}{base + index}", f"{prefix}{start + index}")
+            for index in range(1, count + 1)
+        )
+    if not names:
+        return str
+    pattern = re.compile(
+        r"(?<!\w)("
+        + "|".join(map(re.escape, sorted(names, key=len, reverse=True)))
+        + r")(?!\d)"
+    )
+    return lambda text: pattern.sub(lambda match: names[match[1]], text)
+
+
+@lru_cache(maxsize=4096)
+def _get_skeleton(code: str) -> str:
+    return libcst.parse_module(code).visit(SkeletonTransformer()).code.strip()
+
+
+_function_memos: dict[tuple, FunctionMemo] = {}
+
+
+def get_function_memo(config: Config) -> FunctionMemo:
+    key = (os.getpid(), config.mypy_folder, get_config_fingerprint(config))
+    if key not in _function_memos:
+        _function_memos[key] = FunctionMemo(config)
+    return _function_memos[key]
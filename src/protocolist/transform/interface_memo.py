@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from collections.abc import Sequence
+
+from ..config import Config
+from ..get_config_fingerprint import get_config_fingerprint
+from ..get_external_library_classes import ExternalLibElement
+from ..get_external_library_classes import get_external_library_classes
+from ..interface_lattice import interface_lattice
+from ..run_statistics import run_statistics
+
+Candidates = tuple[tuple[str, ...], tuple[ExternalLibElement, ...]]
+
+
+class InterfaceMemo:
+    """Maps the usage of a parameter to the interfaces it may be annotated
+    with.
+
+    The usage is the set of methods the parameter needs along with the
+    interfaces its arguments must be compatible with. The candidates, i.e.
+    the most specific abstract and builtin classes providing the methods and
+    the external library classes not covered by them, only depend on that
+    usage and the configured libraries, so they are enumerated once for
+    every function sharing it. Validating them still takes probes of the
+    code of each function.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._memory: dict[tuple[frozenset, frozenset], Candidates] = {}
+
+    def get(
+        self,
+        methods: Collection[str],
+        method_compatibility_interfaces: Collection[str],
+    ) -> Candidates:
+        key = (frozenset(methods), frozenset(method_compatibility_interfaces))
+        candidates = self._memory.get(key)
+        run_statistics[
+            (
+                "interface_memo.miss"
+                if candidates is None
+                else "interface_memo.hit"
+            )
+        ] += 1
+        if candidates is None:
+            candidates = self._memory[key] = self._get_candidates(
+                tuple(methods), method_compatibility_interfaces
+            )
+        return candidates
+
+    def _get_candidates(
+        self,
+        methods: Sequence[str],
+        method_compatibility_interfaces: Collection[str],
+    ) -> Candidates:
+        matching_iterfaces = interface_lattice.get_most_specific(
+            interface_lattice.get_providers(methods)
+        )
+        matching_iterfaces = tuple(
+            set(interface_lattice.get_names(matching_iterfaces)).union(
+                interface_lattice.get_names(
+                    interface_lattice.get_subclasses(matching_iterfaces)
+                    & interface_lattice.get_mask(
+                        method_compatibility_interfaces
+                    )
+                )
+            )
+        )
+        return matching_iterfaces, get_external_library_classes(
+            self.config.external_libraries,
+            self.config.excluded_libraries,
+            methods,
+            matching_iterfaces,
+        )
+
+
+_interface_memos: dict[str, InterfaceMemo] = {}
+
+
+def get_interface_memo(config: Config) -> InterfaceMemo:
+    key = get_config_fingerprint(config)
+    if key not in _interface_memos:
+        _interface_memos[key] = InterfaceMemo(config)
+    return _interface_memos[key]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+
+import libcst
+import libcst.matchers as m
+from libcst import BaseStatement
+from libcst import ClassDef
+from libcst import Expr
+from libcst import FunctionDef
+from libcst import Import
+from libcst import ImportFrom
+from libcst import ParserSyntaxError
+from libcst import SimpleStatementLine
+from more_itertools import map_reduce
+
+from .skeleton_transformer import SkeletonTransformer
+
+
+def slice_probe_context(code: str, function_code: str, name: str) -> str:
+    """Keeps of ``code`` what type checking ``function_code`` depends on.
+
+    Imports and compound statements stay as they are, and so do statements
+    mentioning ``name``, since calls of the function constrain its
+    parameters. Definitions of the names reached from these, transitively,
+    are added, with functions and classes reduced to their skeletons.
+    """
+    try:
+        module = libcst.parse_module(code)
+    except ParserSyntaxError:
+        return code
+    mention = re.compile(rf"\b{re.escape(name)}\b")
+    definers = map_reduce(
+        (
+            (defined, index)
+            for index, statement in enumerate(module.body)
+            for defined in _get_defined_names(statement)
+        ),
+        lambda item: item[0],
+        lambda item: item[1],
+    )
+    kept: dict[int, BaseStatement] = {}
+    needed = set()
+    unvisited = []
+
+    def keep(index: int, statement: BaseStatement) -> None:
+        kept[index] = statement
+        for referenced in _get_words(module.code_for_node(statement)):
+            if referenced not in needed:
+                needed.add(referenced)
+                unvisited.append(referenced)
+
+    for referenced in _get_words(function_code):
+        needed.add(referenced)
+        unvisited.append(referenced)
+    for index, statement in enumerate(module.body):
+        if (
+            not isinstance(statement, (FunctionDef, ClassDef))
+            and not _get_defined_names(statement)
+            and not _is_expression(statement)
+        ) or mention.search(module.code_for_node(statement)):
+            keep(index, statement)
+    while unvisited:
+        for index in definers.get(unvisited.pop(), ()):
+            if index not in kept:
+                statement = module.body[index]
+                keep(
+                    index,
+                    (
+                        statement.visit(SkeletonTransformer())
+                        if isinstance(statement, (FunctionDef, ClassDef))
+                        else statement
+                    ),
+                )
+    return module.with_changes(
+        body=tuple(kept[index] for index in sorted(kept))
+    ).code
+
+
+def _get_defined_names(statement: BaseStatement) -> frozenset[str]:
+    if isinstance(statement, (FunctionDef, ClassDef)):
+        return frozenset((statement.name.value,))
+    if not isinstance(statement, SimpleStatementLine) or any(
+        isinstance(element, (Import, ImportFrom)) for element in statement.body
+    ):
+        return frozenset()
+    return frozenset(
+        name.value
+        for target in m.findall(
+            statement, m.AssignTarget() | m.AnnAssign() | m.AugAssign()
+        )
+        for name in m.findall(target.target, m.Name())
+    )
+
+
+def _is_expression(statement: BaseStatement) -> bool:
+    return isinstance(statement, SimpleStatementLine) and all(
+        isinstance(element, Expr) for element in statement.body
+    )
+
+
+def _get_words(code: str) -> Sequence[str]:
+    return re.findall(r"[^\W\d]\w*", code)
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+
+class ProbeTemplate:
+    """Probe code split once around every occurrence of a placeholder.
+
+    Rendering joins the pieces around a replacement, so a batch of probes
+    for the same placeholder does not search the code again for each one.
+    """
+
+    def __init__(self, code: str, placeholder: str):
+        self._pieces = code.split(placeholder)
+
+    def render(self, replacement: str) -> str:
+        return replacement.join(self._pieces)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import libcst
+from libcst import CSTTransformer
+from libcst import FunctionDef
+
+_elided_body = libcst.parse_statement("def _():\n    ...\n").body
+
+
+class SkeletonTransformer(CSTTransformer):
+    """Replaces the body of every function with ``...``."""
+
+    def leave_FunctionDef(
+        self, original_node: "FunctionDef", updated_node: "FunctionDef"
+    ) -> "FunctionDef":
+        return updated_node.with_changes(body=_elided_body)
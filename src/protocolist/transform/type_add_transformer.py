@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import re
 from collections import OrderedDict
+from collections.abc import Callable
 from collections.abc import Collection
 from collections.abc import Iterable
 from collections.abc import Sequence
 from functools import partial
 from itertools import chain
+from itertools import compress
 from itertools import filterfalse
 from pathlib import Path
 from typing import Optional
@@ -23,6 +25,7 @@ from libcst import Param
 from libcst import RemovalSentinel
 from more_itertools import map_reduce
 
+from ..checker.mypy_exception import MypyExceptions
 from ..config import Config
 from ..construct_full_class import construct_full_class
 from ..consts import abc_classes
@@ -31,6 +34,7 @@ from ..consts import builtin_types
 from ..consts import dunder_method_params
 from ..consts import dunder_methods
 from ..consts import exception2method
+from ..consts import exception2method_codes
 from ..consts import existing_types
 from ..consts import hint_translations
 from ..consts import import_statement
@@ -40,24 +44,37 @@ from ..consts import types_parametrized_with_one_parameter
 from ..consts import types_parametrized_with_two_parameters
 from ..extract_annotations import extract_annotations
 from ..get_external_library_classes import ExternalLibElement
-from ..get_external_library_classes import (
-    get_external_library_classes,
-)
+from ..get_mypy_exceptions import get_many_mypy_exceptions
 from ..get_mypy_exceptions import get_mypy_exceptions
+from ..interface_lattice import interface_lattice
 from ..protocol_dict import ProtocolDict
 from ..protocol_markers.marker.type_marker import TypeMarker
 from ..protocol_markers.types_marker_factory import (
     create_type_marker,
 )
+from ..run_statistics import run_statistics
 from ..supports_getitem import SupportsGetitemOption
 from ..to_camelcase import to_camelcase
 from ..transform.class_extractor import ClassExtractor
 from ..transform.class_extractor import GlobalClassExtractor
+from ..transform.function_memo import get_function_memo
+from ..transform.function_memo import reserve_names
 from ..transform.import_visiting_transformer import (
     ImportVisitingTransformer,
 )
+from ..transform.interface_memo import get_interface_memo
+from ..transform.probe_slice import slice_probe_context
+from ..transform.probe_template import ProbeTemplate
 from ..transform.prototype_applier import PrototypeApplier
+from ..transform.usage_collector import get_parameter_usage
 from ..utils.lock import lock
+from ..utils.multi_replacer import MultiReplacer
+
+_max_new_args = 100
+_exception2method = tuple(
+    (re.compile(pattern), method.split("(")[0])
+    for pattern, method in exception2method.items()
+)
 
 
 class TypeAddTransformer(ImportVisitingTransformer):
@@ -71,6 +88,7 @@ class TypeAddTransformer(ImportVisitingTransformer):
         types_marker: TypeMarker,
         class_extractor: GlobalClassExtractor,
         filepath: Path,
+        prefetch: Optional[Collection[FunctionDef]] = None,
     ):
         super().__init__(config, types_marker)
         self._previous_classes = OrderedDict()
@@ -78,21 +96,68 @@ class TypeAddTransformer(ImportVisitingTransformer):
         self.config = config
         self.protocols = protocol
         self.filepath = filepath
-        self.temp_python_file = self.config.mypy_folder
         self.annotations = {}
         self.imports = set()
-        self.full_annotation_to_new = {}
+        self.full_annotation_to_new = MultiReplacer(prefix=": ")
         self._lambda_params = set()
         self._classes_of_methods: dict[FunctionDef, ClassDef] = {}
         self._protocols_with_methods = set()
-        self._function_translations = {}
+        self._function_translations = MultiReplacer()
+        self._introduced_literals: dict[str, tuple[str, int]] = {}
+        self._function_memo = (
+            get_function_memo(config) if config.function_memo else None
+        )
+        self._definitions: list[tuple[str, str]] = []
+        # Only these functions are inferred, to fill the function memo,
+        # and nothing is written.
+        self.prefetch = prefetch
+
+    def visit_Module(self, node: "Module") -> Optional[bool]:
+        self._definitions = [
+            (statement.name.value, Module([statement]).code)
+            for statement in node.body
+            if isinstance(statement, (FunctionDef, ClassDef))
+        ]
+        return super().visit_Module(node)
 
     def leave_FunctionDef(
         self, original_node: "FunctionDef", updated_node: "FunctionDef"
     ) -> "FunctionDef":
+        if self.prefetch is not None and original_node not in self.prefetch:
+            return updated_node
         original_code = Module([original_node]).code
-        if original_node in self._classes_of_methods:
-            class_ = self._classes_of_methods[original_node]
+        class_ = self._classes_of_methods.get(original_node)
+        code = self.filepath.read_text()
+        placeholders = _get_placeholders(updated_node)
+        key = None
+        if self._function_memo is not None:
+            key = self._function_memo.get_key(
+                original_node,
+                class_,
+                (
+                    (
+                        name,
+                        self._function_translations.get(
+                            definition, definition
+                        ),
+                    )
+                    for name, definition in self._definitions
+                ),
+                code,
+            )
+            if self.prefetch is not None:
+                if key in self._function_memo:
+                    return updated_node
+                record = None
+            else:
+                record = self._function_memo.get(key)
+            if record is not None and record["placeholders"].keys() == (
+                placeholders.keys()
+            ):
+                return self._apply_record(
+                    record, placeholders, original_code, updated_node
+                )
+        if class_ is not None:
             updated_function_code = Module(
                 [
                     class_.with_changes(
@@ -107,17 +172,42 @@ class TypeAddTransformer(ImportVisitingTransformer):
             ).code
         else:
             updated_function_code = Module([updated_node]).code
+        context = self._translate_code(code, original_code.rstrip(), "")
+        if self.config.probe_slicing:
+            context = slice_probe_context(
+                context, updated_function_code, original_node.name.value
+            )
         self.updated_code = (
             import_statement
-            + self._translate_code(
-                self.filepath.read_text(), original_code.rstrip(), ""
-            ).removesuffix("\n")
+            + context.removesuffix("\n")
             + "\n"
             + updated_function_code
         )
+        counters = dict(self.protocols.items())
+        imports = set(self.imports)
+        full_annotation_to_new = dict(self.full_annotation_to_new)
+        pending = {
+            placeholder: (
+                to_camelcase(param),
+                int(placeholder.removeprefix(to_camelcase(param))),
+            )
+            for param, placeholder in placeholders.items()
+        }
+        introduced = dict(pending)
+        self._introduced_literals = {}
         for _ in range(20):
-            protocol_items = tuple(self.protocols.items())
-            for protocol in ProtocolDict.get_protocols(self.protocols):
+            # Same order as scanning every protocol registered so far.
+            key_order = {
+                key: index
+                for index, key in enumerate(self.protocols.keys())
+            }
+            for protocol in sorted(
+                pending,
+                key=lambda name: (
+                    key_order.get(pending[name][0], len(key_order)),
+                    pending[name][1],
+                ),
+            ):
                 literal = f"Literal['{protocol}']"
                 if literal not in self.updated_code:
                     continue
@@ -132,21 +222,78 @@ class TypeAddTransformer(ImportVisitingTransformer):
                 self._conv_attribute_to_method()
                 if to_camelcase(protocol) in self.annotations:
                     self.annotations[to_camelcase(protocol)] = interface
-            if protocol_items == tuple(self.protocols.items()):
+                self._introduced_literals.update(
+                    (name, introduced[name])
+                    for name in re.findall(r"Literal\['(\w+)'\]", interface)
+                    if name in introduced
+                )
+            pending, self._introduced_literals = self._introduced_literals, {}
+            introduced.update(pending)
+            if not pending:
                 break
         else:
             raise ValueError
+        protocols = self._get_created_protocols()
+        if key is not None:
+            self._function_memo.set(
+                key,
+                dict(
+                    placeholders=placeholders,
+                    counters={
+                        prefix: (counters.get(prefix, 0), count)
+                        for prefix, count in self.protocols.items()
+                        if count != counters.get(prefix, 0)
+                    },
+                    annotations={
+                        placeholder: self.annotations.get(placeholder)
+                        for placeholder in placeholders.values()
+                    },
+                    protocols=list(protocols.values()),
+                    imports=sorted(self.imports.difference(imports)),
+                    full_annotation_to_new=[
+                        item
+                        for item in self.full_annotation_to_new.items()
+                        if item not in full_annotation_to_new.items()
+                    ],
+                ),
+            )
+        if self.prefetch is not None:
+            for placeholder in placeholders.values():
+                self.annotations.pop(placeholder, None)
+            return updated_node
         with lock:
-            self._save_protocols()
+            self._save_protocols(protocols)
+            result = self._update_parameters(updated_node)
+            self._function_translations[original_code] = Module([result]).code
+            return result
+
+    def _apply_record(
+        self,
+        record: dict,
+        placeholders: dict[str, str],
+        original_code: str,
+        updated_node: FunctionDef,
+    ) -> FunctionDef:
+        with lock:
+            rename = reserve_names(record, placeholders, self.protocols)
+            for placeholder, annotation in record["annotations"].items():
+                self.annotations[rename(placeholder)] = (
+                    annotation and rename(annotation)
+                )
+            self.full_annotation_to_new.update(
+                (rename(full_annotation), rename(new_annotation))
+                for full_annotation, new_annotation in record[
+                    "full_annotation_to_new"
+                ]
+            )
+            self.imports.update(map(tuple, record["imports"]))
+            self._write_protocols(map(rename, record["protocols"]))
             result = self._update_parameters(updated_node)
             self._function_translations[original_code] = Module([result]).code
             return result
 
     def _translate_code(self, code: str, original: str, updated: str):
-        for key, value in sorted(
-            self._function_translations.items(), key=lambda item: -len(item[0])
-        ):
-            code = code.replace(key, value)
+        code = self._function_translations.replace(code)
         code = code.replace(original, updated)
         contains_all = type(
             "Protocols",
@@ -165,11 +312,7 @@ class TypeAddTransformer(ImportVisitingTransformer):
         )
 
     def new_protocols_code(self, code: str) -> str:
-        for full_annotation, new_annotation in sorted(
-            self.full_annotation_to_new.items(), key=lambda item: -len(item[0])
-        ):
-            code = code.replace(f": {full_annotation}", f": {new_annotation}")
-        return code
+        return self.full_annotation_to_new.replace(code)
 
     def visit_ClassDef(self, node: "ClassDef") -> Optional[bool]:
         full_class_node = construct_full_class(
@@ -194,14 +337,16 @@ class TypeAddTransformer(ImportVisitingTransformer):
         assert isinstance(function_def, FunctionDef)
         return function_def
 
-    def _save_protocols(self):
-        protocols = self._get_created_protocols()
+    def _save_protocols(self, protocols: dict[str, str]):
         for prototype_code in protocols.values():
             self.updated_code = self.updated_code.replace(
                 prototype_code.replace(self.config.tab_length * " ", "\t"),
                 "",
                 1,
             )
+        self._write_protocols(protocols.values())
+
+    def _write_protocols(self, protocols: Iterable[str]):
         interface_code = import_statement
         if self.config.interfaces_path.exists():
             interface_code = (
@@ -219,7 +364,7 @@ class TypeAddTransformer(ImportVisitingTransformer):
             + "\n".join(
                 map(
                     "@runtime_checkable\n{}".format,
-                    map(str.lstrip, protocols.values()),
+                    map(str.lstrip, protocols),
                 )
             )
         )
@@ -231,12 +376,13 @@ class TypeAddTransformer(ImportVisitingTransformer):
         )
 
     def _conv_attribute_to_method(self):
-        exceptions = get_mypy_exceptions(
-            self.temp_python_file, self.updated_code
+        exceptions = get_mypy_exceptions(self.config, self.updated_code)
+        callable_pattern = re.compile(
+            r"\"Literal\[\'([^\']+)\'\]\" not callable"
+        )
+        call_exceptions = exceptions.search(
+            callable_pattern, "misc", "operator"
         )
-        callable_pattern = r"\"Literal\[\'([^\']+)\'\]\" not callable"
-        search = re.compile(callable_pattern).search
-        call_exceptions = list(map(search, filter(search, exceptions)))
         for exception in call_exceptions:
             literal_name = exception.group(1)
             field_name = re.findall(
@@ -274,74 +420,87 @@ class TypeAddTransformer(ImportVisitingTransformer):
                 )
                 commented_classes += 1
             class_code = self._add_args(class_code, class_name)
-            exceptions = get_mypy_exceptions(
-                self.temp_python_file, self.updated_code
-            )
-            unexpected_kwargs_pattern = (
+            exceptions = get_mypy_exceptions(self.config, self.updated_code)
+            unexpected_kwargs_pattern = re.compile(
                 r"Unexpected keyword argument "
                 r"\"([^\"]+)\" for \"([^\"]+)\""
             )
-            search = re.compile(unexpected_kwargs_pattern).search
-            unexpected_kwargs_exceptions = map_reduce(
-                map(search, filter(search, exceptions)),
+            kwarg_names = map_reduce(
+                exceptions.search(unexpected_kwargs_pattern, "call-arg"),
                 lambda exception: exception.group(2),
                 lambda exception: exception.group(1),
+                lambda names: tuple(dict.fromkeys(names)),
             )
-            for (
-                function_name,
-                kwarg_names,
-            ) in unexpected_kwargs_exceptions.items():
-                for kwarg_name in set(kwarg_names):
-                    function_signature = self._get_function_signature(
+            signatures = {
+                function_name: signature
+                for function_name in kwarg_names
+                if (
+                    signature := self._get_function_signature(
                         function_name, class_code
                     )
-                    if function_signature is None:
-                        continue
-                    exceptions = get_mypy_exceptions(
-                        self.temp_python_file,
-                        self.updated_code.replace(
-                            class_code,
-                            class_code.replace(
-                                function_signature,
-                                function_signature + f", {kwarg_name}: None",
-                                1,
-                            ),
-                        ),
-                    )
-                    compatible_type = self._handle_incompatible_type(
-                        function_name, exceptions, class_name
-                    )
-                    self.updated_code = self.updated_code.replace(
-                        class_code,
-                        class_code.replace(
-                            function_signature,
-                            function_signature
-                            + f", {kwarg_name}: {compatible_type}",
-                            1,
+                )
+                is not None
+            }
+
+            def add_kwargs(get_hint: Callable[[str, str], str]) -> str:
+                new_class_code = class_code
+                for function_name, signature in signatures.items():
+                    new_class_code = new_class_code.replace(
+                        signature,
+                        signature
+                        + "".join(
+                            f", {kwarg_name}: "
+                            + get_hint(function_name, kwarg_name)
+                            for kwarg_name in kwarg_names[function_name]
                         ),
+                        1,
                     )
+                return new_class_code
+
+            if signatures:
+                # mypy names the keyword in the errors of each argument, so
+                # one probe with every keyword typed None is enough
+                exceptions = get_mypy_exceptions(
+                    self.config,
+                    self.updated_code.replace(
+                        class_code, add_kwargs(lambda *_: "None")
+                    ),
+                )
+                self.updated_code = self.updated_code.replace(
+                    class_code,
+                    add_kwargs(
+                        lambda function_name, kwarg_name: (
+                            self._handle_incompatible_type(
+                                function_name,
+                                exceptions,
+                                class_name,
+                                f'"{kwarg_name}"',
+                            )
+                        )
+                    ),
+                )
             self.updated_code = self.updated_code.replace(
                 "'''", "", 2 * commented_classes
             )
             self._protocols_with_methods.add(class_name)
 
     def _handle_incompatible_type(
-        self, function_name: str, exceptions: list[str], class_name: str
+        self,
+        function_name: str,
+        exceptions: MypyExceptions,
+        class_name: str,
+        argument: str = r"\S+",
     ):
-        incompatible_type_pattern = rf"Argument \S+ to \"{function_name}\" of \"[^\"]+\" has incompatible type \"([^\"]+)\"; expected \"None\""  # noqa: E501
-        incompatible_type_search = re.compile(incompatible_type_pattern).search
+        incompatible_type_pattern = rf"Argument {argument} to \"{function_name}\" of \"[^\"]+\" has incompatible type \"([^\"]+)\"; expected \"None\""  # noqa: E501
         types = tuple(
             hint_translations.get(type, type)
             for type in set(
                 map(
                     str.strip,
                     chain.from_iterable(
-                        (
-                            incompatible_type_exception.group(1).split("|")
-                            for incompatible_type_exception in map(
-                                incompatible_type_search,
-                                filter(incompatible_type_search, exceptions),
-                            )
+                        incompatible_type_exception.group(1).split("|")
+                        for incompatible_type_exception in exceptions.search(
+                            re.compile(incompatible_type_pattern), "arg-type"
                         )
                     ),
                 )
@@ -360,55 +519,67 @@ class TypeAddTransformer(ImportVisitingTransformer):
         return f"Union[{', '.join(types)}]"
 
     def _get_compatible_interfaces(
-        self, patterns: Iterable[str], exceptions: Collection[str]
+        self,
+        patterns: Iterable[str],
+        exceptions: MypyExceptions,
+        *codes: str,
     ) -> Sequence[set[str]]:
         def get_interfaces(pattern: str):
-            pattern_search = re.compile(pattern).search
             return set(
                 elem.partition("[")[0]
                 for elem in chain.from_iterable(
-                    pattern.group(1).split(" | ")
-                    for pattern in map(
-                        pattern_search, filter(pattern_search, exceptions)
-                    )
+                    match.group(1).split(" | ")
+                    for match in exceptions.search(re.compile(pattern), *codes)
                 )
             ) - {"Literal"}
 
         return tuple(map(get_interfaces, patterns))
 
     def _get_missing_interface(self, class_name: str) -> str:
-        previous_exceptions = get_mypy_exceptions(
-            self.temp_python_file,
-            self.new_protocols_code(
-                self.updated_code.replace(f"Literal['{class_name}']", ANY)
-            ),
-        )
-        exceptions = set(
-            get_mypy_exceptions(
-                self.temp_python_file,
-                self.new_protocols_code(
-                    self.updated_code.replace(
-                        f"Literal['{class_name}']", "None"
-                    )
+        code = self.updated_code
+        usage = get_parameter_usage(code, f"Literal['{class_name}']")
+        template = ProbeTemplate(code, f"Literal['{class_name}']")
+        previous_code = self.new_protocols_code(template.render(ANY))
+        previous_exceptions = None
+
+        def get_previous_exceptions() -> MypyExceptions:
+            nonlocal previous_exceptions
+            if previous_exceptions is None:
+                previous_exceptions = get_mypy_exceptions(
+                    self.config, previous_code
+                )
+            return previous_exceptions
+
+        if usage is None:
+            run_statistics["usage_collector.miss"] += 1
+            exceptions, previous_exceptions = get_many_mypy_exceptions(
+                self.config,
+                (
+                    self.new_protocols_code(template.render("None")),
+                    previous_code,
                 ),
             )
-        ).difference(previous_exceptions)
-        if not exceptions:
+            exceptions = exceptions.difference(previous_exceptions)
+        else:
+            run_statistics["usage_collector.hit"] += 1
+            exceptions = MypyExceptions()
+        if not exceptions and (usage is None or not usage.methods):
             return ANY
         literal = next(
-            chain.from_iterable(
-                re.findall(
-                    r"Argument 2 to \"[^\"]+\" of \"[^\"]+\" has "
-                    r"incompatible type \"None\"; "
-                    r"expected \"(Literal\[[^\]]+\])",
-                    exception,
+            iter(
+                exceptions.search(
+                    re.compile(
+                        r"Argument 2 to \"[^\"]+\" of \"[^\"]+\" has "
+                        r"incompatible type \"None\"; "
+                        r"expected \"(Literal\[[^\]]+\])"
+                    ),
+                    "arg-type",
                 )
-                for exception in exceptions
             ),
             None,
         )
         if literal:
-            return literal
+            return literal.group(1)
         method_compatibility_interfaces = self._get_compatible_interfaces(
             [r"has incompatible type \"None\"; expected \"([^\"]+)\""],
             exceptions,
@@ -422,6 +593,7 @@ class TypeAddTransformer(ImportVisitingTransformer):
                         r"No overload variant of \"open\" matches argument types* (\"None\")",  # noqa: E501
                     ],
                     exceptions,
+                    "call-overload",
                 )
             )
             else tuple()
@@ -435,6 +607,7 @@ class TypeAddTransformer(ImportVisitingTransformer):
                         r"No overload variant of \"pow\" matches argument types* \"[^\"]+\", (\"None\")",  # noqa: E501
                     ],
                     exceptions,
+                    "call-overload",
                 )
             )
             else tuple()
@@ -449,48 +622,44 @@ class TypeAddTransformer(ImportVisitingTransformer):
                         r"No overload variant of \"range\" matches argument types* (\"None\")",  # noqa: E501
                     ],
                     exceptions,
+                    "call-overload",
                 )
             )
             else tuple()
         )
         methods = tuple(
             frozenset(
-                method.split("(")[0]
-                for pattern, method in exception2method.items()
-                if any(map(re.compile(pattern).search, exceptions))
+                method
+                for pattern, method in _exception2method
+                if exceptions.search(pattern, *exception2method_codes)
             )
         )
-        pattern_search = re.compile(
-            r"\"None\" has no attribute \"([^\"]+)\""
-        ).search
         attributes = set(
-            pattern.group(1)
-            for pattern in map(
-                pattern_search, filter(pattern_search, exceptions)
+            match.group(1)
+            for match in exceptions.search(
+                re.compile(r"\"None\" has no attribute \"([^\"]+)\""),
+                "attr-defined",
+                "union-attr",
             )
         )
+        if usage is not None:
+            attributes.update(usage.methods)
+            method_compatibility_interfaces.update(
+                usage.compatible_interfaces
+            )
         methods = list(attributes.union(methods))
         if not methods:
             method_compatibility_interfaces = set(
-                interface
-                for interface, superclasses, _ in (abc_classes + builtin_types)
-                if not any(
-                    map(
-                        method_compatibility_interfaces.__contains__,
-                        superclasses,
+                interface_lattice.get_names(
+                    interface_lattice.get_most_specific(
+                        interface_lattice.get_mask(
+                            method_compatibility_interfaces
+                        )
                     )
                 )
-                and interface in method_compatibility_interfaces
             ).union(
                 filterfalse(
-                    frozenset(
-                        chain.from_iterable(
-                            (interface, *superclasses)
-                            for interface, superclasses, _ in (
-                                abc_classes + builtin_types
-                            )
-                        )
-                    ).__contains__,
+                    interface_lattice.__contains__,
                     method_compatibility_interfaces,
                 )
             )
@@ -499,38 +668,9 @@ class TypeAddTransformer(ImportVisitingTransformer):
                 if method_compatibility_interfaces
                 else ANY
             )
-        matching_iterfaces = tuple(
-            (interface, superclasses)
-            for interface, superclasses, interface_methods in (
-                abc_classes + builtin_types
-            )
-            if all(map(interface_methods.__contains__, methods))
-        )
-        valid_interface_names = tuple(
-            interface for interface, _ in matching_iterfaces
-        )
-        matching_iterfaces = set(
-            interface
-            for interface, superclasses in matching_iterfaces
-            if not any(map(valid_interface_names.__contains__, superclasses))
-        )
-        matching_iterfaces = tuple(
-            matching_iterfaces.union(
-                interface
-                for interface in method_compatibility_interfaces
-                for interface_name, superclasses, _ in (
-                    abc_classes + builtin_types
-                )
-                if interface == interface_name
-                and any(map(superclasses.__contains__, matching_iterfaces))
-            )
-        )
-        external_lib_entries = get_external_library_classes(
-            self.config.external_libraries,
-            self.config.excluded_libraries,
-            methods,
-            matching_iterfaces,
-        )
+        matching_iterfaces, external_lib_entries = get_interface_memo(
+            self.config
+        ).get(methods, method_compatibility_interfaces)
         patterns = (
             r'Non-overlapping equality check \(left operand type: "[^"]*None[^"]*", right operand type: "([^"]+)"',  # noqa: E501
             r'Non-overlapping equality check \(left operand type: "([^"]+)", right operand type: "[^"]*None[^"]*"',  # noqa: E501
@@ -547,56 +687,71 @@ class TypeAddTransformer(ImportVisitingTransformer):
             ).union(matching_iterfaces)
         )
 
-        def is_signature_correct(interface: str, exceptions: set[str]) -> bool:
-            new_exceptions = set(exceptions).difference(previous_exceptions)
-            return not any(
-                re.search(
-                    rf"No overload variant of \"[^\"]+\" of \"{interface}\" matches argument",  # noqa: E501
-                    exception,
-                )
-                or re.search(r" has incompatible type ", exception)
-                or (
-                    re.search(r" Unsupported operand types for ", exception)
-                    and not re.search(
+        def is_signature_correct(
+            interface: str, exceptions: MypyExceptions
+        ) -> bool:
+            new_exceptions = exceptions.difference(get_previous_exceptions())
+            return not (
+                new_exceptions.search(
+                    re.compile(
+                        rf"No overload variant of \"[^\"]+\" of \"{interface}\" matches argument"  # noqa: E501
+                    ),
+                    "call-overload",
+                    "operator",
+                )
+                or new_exceptions.search(
+                    re.compile(r" has incompatible type ")
+                )
+                or any(
+                    not re.search(
                         r"Unsupported operand types for [%\+\*-/]+ "
                         rf"\(\"{interface}\" and \"Literal\['\w+'\]\"",
-                        exception,
+                        match.string,
+                    )
+                    for match in new_exceptions.search(
+                        re.compile(r"Unsupported operand types for "),
+                        "operator",
                     )
                 )
-                or re.search(r" is not indexable ", exception)
-                for exception in new_exceptions
+                or new_exceptions.search(
+                    re.compile(r" is not indexable"), "index"
+                )
             )
 
-        def is_interface_valid(interface: str) -> bool:
-            exceptions = get_mypy_exceptions(
-                self.temp_python_file,
-                self.updated_code.replace(
-                    f"Literal['{class_name}']", interface
-                ),
-            )
-            return is_signature_correct(
-                interface,
-                exceptions,
+        def are_interfaces_valid(interfaces: Sequence[str]) -> list[bool]:
+            return list(
+                map(
+                    is_signature_correct,
+                    interfaces,
+                    get_many_mypy_exceptions(
+                        self.config,
+                        tuple(map(template.render, interfaces)),
+                    ),
+                )
             )
 
-        def is_external_lib_valid(element: ExternalLibElement) -> bool:
-            exceptions = get_mypy_exceptions(
-                self.temp_python_file,
-                self.new_protocols_code(
-                    f"from {element.module_name} import {element.item_name}\n"
-                    + self.updated_code.replace(
-                        f"Literal['{class_name}']", element.item_name
-                    )
-                ),
-            )
-            exceptions = set(
-                f"{str(int(line.split(":", 1)[0]) - 1)}:"
-                f"{line.split(":", 1)[-1]}"
-                for line in exceptions
-            )
-            return is_signature_correct(
-                element.item_name,
-                exceptions,
+        def are_external_libs_valid(
+            elements: Sequence[ExternalLibElement],
+        ) -> list[bool]:
+            return list(
+                map(
+                    is_signature_correct,
+                    (element.item_name for element in elements),
+                    (
+                        exceptions.shift_lines(-1)
+                        for exceptions in get_many_mypy_exceptions(
+                            self.config,
+                            tuple(
+                                self.new_protocols_code(
+                                    f"from {element.module_name} "
+                                    f"import {element.item_name}\n"
+                                    + template.render(element.item_name)
+                                )
+                                for element in elements
+                            ),
+                        )
+                    ),
+                )
             )
 
         def add_subtypes(interface: str) -> str:
@@ -657,7 +812,10 @@ class TypeAddTransformer(ImportVisitingTransformer):
             return interface
 
         valid_external_lib_entries = tuple(
-            filter(is_external_lib_valid, external_lib_entries)
+            compress(
+                external_lib_entries,
+                are_external_libs_valid(external_lib_entries),
+            )
         )
         self.imports.update(
             frozenset(
@@ -672,13 +830,19 @@ class TypeAddTransformer(ImportVisitingTransformer):
         )
         valid_iterfaces = []
         while matching_iterfaces:
-            for interface in frozenset(
-                interface
-                for interface, superclasses, _ in (abc_classes + builtin_types)
-                if interface in matching_iterfaces
-                and not any(map(matching_iterfaces.__contains__, superclasses))
+            candidates = tuple(
+                frozenset(
+                    interface_lattice.get_names(
+                        interface_lattice.get_most_specific(
+                            interface_lattice.get_mask(matching_iterfaces)
+                        )
+                    )
+                )
+            )
+            for interface, is_valid in zip(
+                candidates, are_interfaces_valid(candidates)
             ):
-                if is_interface_valid(interface):
+                if is_valid:
                     valid_iterfaces.append(interface)
                     for removed_interface in frozenset(
                         interface
@@ -692,6 +856,7 @@ class TypeAddTransformer(ImportVisitingTransformer):
                 matching_iterfaces.remove(interface)
         if not valid_iterfaces and matching_iterfaces:
             return ANY
+        self._prefetch_subscripts(class_name, valid_iterfaces)
         valid_iterfaces = tuple(map(add_subtypes, valid_iterfaces))
         valid_elements = [
             *tuple(sorted(map(_add_collections, valid_iterfaces))),
@@ -732,6 +897,49 @@ class TypeAddTransformer(ImportVisitingTransformer):
             return f"Union[{', '.join(valid_elements)}]"
         return valid_elements[0]
 
+    def _prefetch_subscripts(
+        self, class_name: str, interfaces: Iterable[str]
+    ) -> None:
+        """Checks the first probes of the subscripts of ``interfaces`` at once.
+
+        The subscripts are still inferred one after the other, since each
+        inference may change the code the next one sees, but the probes
+        they start with land in one batch, which the pool and service
+        checkers split over their processes, and are then read from the
+        probe cache. A second subscript depends on the first one and is
+        left out.
+        """
+        if (
+            self.config.probe_cache_size <= 0
+            and not self.config.persistent_probe_cache
+        ):
+            return
+        probes = []
+        for interface in interfaces:
+            if interface in types_parametrized_with_one_parameter:
+                subscript = class_name + "Subscript"
+                new = f"{interface}[Literal['{subscript}']]"
+            elif interface in types_parametrized_with_two_parameters:
+                subscript = class_name + "FirstSubscript"
+                new = f"{interface}[Literal['{subscript}'], Any]"
+            else:
+                continue
+            code = self.updated_code.replace(
+                f"Literal['{class_name}']", new, 1
+            )
+            if (
+                get_parameter_usage(code, f"Literal['{subscript}']")
+                is not None
+            ):
+                continue
+            template = ProbeTemplate(code, f"Literal['{subscript}']")
+            probes.extend(
+                self.new_protocols_code(template.render(value))
+                for value in ("None", ANY)
+            )
+        if len(probes) > 2:
+            get_many_mypy_exceptions(self.config, probes)
+
     def _filter_valid_interfaces(
         self,
         valid_interfaces: Iterable[str],
@@ -790,8 +998,11 @@ class TypeAddTransformer(ImportVisitingTransformer):
             if attr_field in dunder_methods:
                 parameters = ", ".join(dunder_method_params[attr_field])
                 return f"def {attr_field}({parameters}):\n\t\t..."
-            literal_name = to_camelcase(attr_field) + str(
-                self.protocols[to_camelcase(attr_field)]
+            number = self.protocols[to_camelcase(attr_field)]
+            literal_name = to_camelcase(attr_field) + str(number)
+            self._introduced_literals[literal_name] = (
+                to_camelcase(attr_field),
+                number,
             )
             return f"{attr_field}: Literal['{literal_name}']"
 
@@ -839,80 +1050,102 @@ class TypeAddTransformer(ImportVisitingTransformer):
         return f"Union[{', '.join(combined_elements)}]"
 
     def _add_args(self, class_code: str, class_name: str) -> str:
-        exceptions = get_mypy_exceptions(
-            self.temp_python_file, self.updated_code
-        )
-        to_many_args_pattern = (
-            r"error: Too many arguments for " r"\"([^\"]+)\""
-        )
-        search = re.compile(to_many_args_pattern).search
-
-        def get_signature(match: re.Match) -> Optional[str]:
-            return self._get_function_signature(match.group(1), class_code)
+        """Adds the positional parameters every call of a method passes.
 
-        new_class_code = class_code
-        for _ in range(100):
-            many_args_exceptions = list(
-                map(search, filter(search, exceptions))
-            )
-            if not any(filter(None, map(get_signature, many_args_exceptions))):
-                return new_class_code
-            for exception in frozenset(many_args_exceptions):
-                function_name = exception.group(1)
-                function_signature = self._get_function_signature(
-                    function_name, class_code
+        One probe declares ``_max_new_args`` ``None`` parameters more on
+        each method called with too many arguments, along with ``**kwargs``
+        since mypy does not report missing arguments of calls with unexpected
+        keywords. The first parameter a call leaves missing gives its arity,
+        and the incompatible argument types give the hints of the parameters
+        all calls pass.
+        """
+        exceptions = get_mypy_exceptions(self.config, self.updated_code)
+        to_many_args_pattern = re.compile(
+            r"Too many arguments for " r"\"([^\"]+)\""
+        )
+        signatures = {
+            function_name: signature
+            for function_name, signature in (
+                (
+                    match.group(1),
+                    self._get_function_signature(match.group(1), class_code),
                 )
-                if function_signature is None:
-                    continue
-                n_args = len(
-                    re.findall(
-                        r"\d+",
-                        function_signature,
-                    )
+                for match in exceptions.search(
+                    to_many_args_pattern, "call-arg"
                 )
-                exceptions = get_mypy_exceptions(
-                    self.temp_python_file,
-                    self.updated_code.replace(
-                        class_code,
-                        class_code.replace(
-                            function_signature,
-                            function_signature + f", arg{n_args}: None",
-                            1,
-                        ),
-                    ),
+            )
+            if signature is not None
+        }
+        if not signatures:
+            return class_code
+        first_new_args = {
+            function_name: len(re.findall(r"\d+", signature))
+            for function_name, signature in signatures.items()
+        }
+        probe_class_code = class_code
+        for function_name, signature in signatures.items():
+            probe_class_code = probe_class_code.replace(
+                signature,
+                signature
+                + "".join(
+                    f", arg{first_new_args[function_name] + index}: None"
+                    for index in range(_max_new_args)
                 )
-                to_little_args_pattern = (
-                    r"error: Missing positional argument "
-                    f'"arg{n_args}" in call to '
-                    f'"{function_name}" of "{class_name}"'
+                + f", **kwargs: {ANY}",
+                1,
+            )
+        exceptions = get_mypy_exceptions(
+            self.config,
+            self.updated_code.replace(class_code, probe_class_code),
+        )
+        new_class_code = class_code
+        for function_name, signature in signatures.items():
+            n_new_args = min(
+                (
+                    int(match.group(1)) - first_new_args[function_name]
+                    for match in exceptions.search(
+                        re.compile(
+                            r"Missing positional arguments? \"arg(\d+)\""
+                            r"[^\n]* in call to "
+                            f'"{function_name}" of "{class_name}"'
+                        ),
+                        "call-arg",
+                    )
+                ),
+                default=_max_new_args,
+            )
+            if n_new_args >= _max_new_args:
+                raise ValueError(
+                    f"Calls of {class_name}.{function_name} pass at least "
+                    f"{_max_new_args} arguments more than it declares, the "
+                    "most a single probe can add"
                 )
-                if any(
-                    map(re.compile(to_little_args_pattern).search, exceptions)
-                ):
-                    return new_class_code
+            n_params = len(
+                libcst.parse_statement(
+                    signature + "):\n\t...\n"
+                ).params.params
+            )
+            new_signature = signature
+            for index in range(n_new_args):
                 hint = self._handle_incompatible_type(
-                    function_name, exceptions, class_name
+                    function_name,
+                    exceptions,
+                    class_name,
+                    str(n_params + index),
                 )
+                # Named like adding them one by one always did
+                name = "arg" + str(len(re.findall(r"\d+", new_signature)))
                 if hint != ANY or self.config.allow_any:
-                    new_class_code = class_code.replace(
-                        function_signature,
-                        function_signature + f", arg{n_args}: {hint}",
-                        1,
-                    )
+                    new_signature += f", {name}: {hint}"
                 else:
-                    new_class_code = class_code.replace(
-                        function_signature,
-                        function_signature + f", arg{n_args}",
-                        1,
-                    )
-                self.updated_code = self.updated_code.replace(
-                    class_code, new_class_code
-                )
-                class_code = new_class_code
-                exceptions = get_mypy_exceptions(
-                    self.temp_python_file, self.updated_code
-                )
-        raise ValueError
+                    new_signature += f", {name}"
+            new_class_code = new_class_code.replace(
+                signature, new_signature, 1
+            )
+        self.updated_code = self.updated_code.replace(
+            class_code, new_class_code
+        )
+        return new_class_code
 
 
 def divided_to_sub_elements(interface: str) -> set[str]:
@@ -937,6 +1170,22 @@ def divided_to_sub_elements(interface: str) -> set[str]:
     return new_elements
 
 
+def _get_placeholders(function: FunctionDef) -> dict[str, str]:
+    placeholders = {}
+    for param in chain(
+        function.params.posonly_params,
+        function.params.params,
+        function.params.kwonly_params,
+    ):
+        try:
+            placeholders[param.name.value] = param.annotation.annotation.slice[
+                0
+            ].slice.value.evaluated_value
+        except AttributeError:
+            continue
+    return placeholders
+
+
 def _add_collections(interface: str) -> str:
     return (interface in abc_classes) * "collections.abc." + interface
 
@@ -950,8 +1199,6 @@ def _is_compatible(
         return True
     if interface not in existing_types:
         return True
-    return all(
-        all(map(superclasses.__contains__, compatible_interfaces))
-        for builtin_interface, superclasses, _ in (abc_classes + builtin_types)
-        if interface == builtin_interface
+    return interface not in interface_lattice.methods or (
+        interface_lattice.has_superclasses(interface, compatible_interfaces)
     )
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+from typing import Optional
+
+import libcst
+from libcst import Arg
+from libcst import AssignTarget
+from libcst import Attribute
+from libcst import AugAssign
+from libcst import BinaryOperation
+from libcst import Call
+from libcst import CompFor
+from libcst import For
+from libcst import Module
+from libcst import Name
+from libcst import Param
+from libcst import ParserSyntaxError
+from libcst import Subscript
+from libcst.metadata import ExpressionContext
+from libcst.metadata import ExpressionContextProvider
+from libcst.metadata import MetadataWrapper
+from libcst.metadata import ParentNodeProvider
+from libcst.metadata import ScopeProvider
+
+_operator2method = {
+    libcst.Add: "__add__",
+    libcst.Subtract: "__sub__",
+    libcst.Multiply: "__mul__",
+    libcst.Power: "__pow__",
+    libcst.Modulo: "__divmod__",
+    libcst.Divide: "__truediv__",
+    libcst.FloorDivide: "__floordiv__",
+}
+_builtin2usage = {
+    "len": ("__len__", ("Sized",)),
+    "iter": ("__iter__", ()),
+    "next": ("__next__", ()),
+}
+
+
+class ParameterUsage(NamedTuple):
+    methods: frozenset[str]
+    compatible_interfaces: frozenset[str]
+
+
+class UnknownUsage(Exception):
+    pass
+
+
+class UsageCollector(libcst.CSTVisitor):
+    """Collects the methods parameters annotated with ``annotation`` need.
+
+    Only usages whose mypy errors, with ``None`` substituted for the
+    annotation, are fully understood are accepted: attribute access, left
+    operands of arithmetic, subscripts read, assigned, augmented or deleted,
+    ``len``/``iter``/``next`` and iteration. Anything else raises
+    ``UnknownUsage``.
+    """
+
+    METADATA_DEPENDENCIES = (
+        ScopeProvider,
+        ParentNodeProvider,
+        ExpressionContextProvider,
+    )
+
+    def __init__(self, annotation: str):
+        super().__init__()
+        self.annotation = annotation
+        self.parameters = 0
+        self.methods = set()
+        self.compatible_interfaces = set()
+
+    def visit_Param(self, node: "Param") -> Optional[bool]:
+        if (
+            node.annotation is None
+            or Module([]).code_for_node(node.annotation.annotation)
+            != self.annotation
+        ):
+            return None
+        if node.star:
+            raise UnknownUsage
+        self.parameters += 1
+        assignments = self.get_metadata(ScopeProvider, node)[node.name.value]
+        if len(assignments) != 1:
+            raise UnknownUsage
+        for access in next(iter(assignments)).references:
+            self._collect(access.node)
+        return None
+
+    def _collect(self, node: Name) -> None:
+        parent = self.get_metadata(ParentNodeProvider, node)
+        if isinstance(parent, Attribute) and parent.value is node:
+            self.methods.add(parent.attr.value)
+        elif (
+            isinstance(parent, BinaryOperation)
+            and parent.left is node
+            and type(parent.operator) in _operator2method
+        ):
+            self.methods.add(_operator2method[type(parent.operator)])
+        elif isinstance(parent, Subscript) and parent.value is node:
+            self.methods.update(self._get_subscript_methods(parent))
+        elif isinstance(parent, (For, CompFor)) and parent.iter is node:
+            if parent.asynchronous:
+                raise UnknownUsage
+            self.methods.add("__iter__")
+        elif isinstance(parent, Arg) and self._is_builtin_argument(parent):
+            call = self.get_metadata(ParentNodeProvider, parent)
+            method, compatible_interfaces = _builtin2usage[call.func.value]
+            self.methods.add(method)
+            self.compatible_interfaces.update(compatible_interfaces)
+        else:
+            raise UnknownUsage
+
+    def _get_subscript_methods(self, subscript: Subscript) -> set[str]:
+        context = self.get_metadata(ExpressionContextProvider, subscript)
+        if context == ExpressionContext.LOAD:
+            return {"__getitem__"}
+        if context == ExpressionContext.DEL:
+            return {"__delitem__"}
+        grandparent = self.get_metadata(ParentNodeProvider, subscript)
+        if isinstance(grandparent, AssignTarget):
+            return {"__setitem__"}
+        if isinstance(grandparent, AugAssign):
+            return {"__getitem__", "__setitem__"}
+        raise UnknownUsage
+
+    def _is_builtin_argument(self, arg: Arg) -> bool:
+        call = self.get_metadata(ParentNodeProvider, arg)
+        return (
+            isinstance(call, Call)
+            and isinstance(call.func, Name)
+            and call.func.value in _builtin2usage
+            and len(call.args) == 1
+            and arg.keyword is None
+            and not arg.star
+        )
+
+
+def get_parameter_usage(
+    code: str, annotation: str
+) -> Optional[ParameterUsage]:
+    try:
+        wrapper = MetadataWrapper(libcst.parse_module(code))
+    except ParserSyntaxError:
+        return None
+    collector = UsageCollector(annotation)
+    try:
+        wrapper.visit(collector)
+    except UnknownUsage:
+        return None
+    if not collector.parameters or collector.parameters != code.count(
+        annotation
+    ):
+        return None
+    return ParameterUsage(
+        frozenset(collector.methods),
+        frozenset(collector.compatible_interfaces),
+    )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+
+class MultiReplacer(dict):
+    """Replaces every key by its value in one pass, longest keys first.
+
+    ``prefix`` is prepended to both sides of each replacement. The pattern is
+    only recompiled after keys were added, not when values change.
+    """
+
+    def __init__(self, *args, prefix: str = "", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prefix = prefix
+        self._pattern: Optional[re.Pattern] = None
+
+    def __setitem__(self, key: str, value: str):
+        if key not in self:
+            self._pattern = None
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def replace(self, text: str) -> str:
+        if not self:
+            return text
+        if self._pattern is None:
+            self._pattern = re.compile(
+                "|".join(
+                    re.escape(self.prefix + key)
+                    for key in sorted(self, key=len, reverse=True)
+                )
+            )
+        return self._pattern.sub(
+            lambda match: self.prefix + self[match[0][len(self.prefix) :]],
+            text,
+        )
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from protocolist.config import Config
+from protocolist.main import protocol
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+
+
+class TestAddArgs(TestCase):
+    def _get_protocols(self, code: str) -> str:
+        with TemporaryDirectory(
+            dir="tests"
+        ) as folder, TemporaryDirectory() as mypy_folder:
+            filepath = Path(folder) / "test.py"
+            protocols_path = Path(folder) / "protocols.py"
+            filepath.write_text(code)
+            protocols_path.write_text("")
+            protocol(
+                Config(
+                    pos_args=[str(filepath)],
+                    interfaces_path=str(protocols_path),
+                    mypy_folder=mypy_folder,
+                    protocol_presentation=(
+                        PresentationOption.PARTIAL_PROTOCOLS
+                    ),
+                    incremental=False,
+                    function_memo=False,
+                )
+            )
+            return protocols_path.read_text()
+
+    def test_arity_is_the_one_all_calls_share(self):
+        self.assertIn(
+            "def method(self, arg0: int, arg1: str, key:",
+            self._get_protocols(
+                "def foo(x):\n"
+                '    x.method(1, "a", key=1)\n'
+                '    x.method(2, "b", 3.0)\n'
+            ),
+        )
+
+    def test_every_keyword_is_typed(self):
+        self.assertIn(
+            "def method(self, arg0: int, key: int, other: str)",
+            self._get_protocols(
+                'def foo(x):\n    x.method(1, key=1, other="s")\n'
+            ),
+        )
+
+    def test_arity_beyond_a_probe_is_reported(self):
+        with patch(
+            "protocolist.transform.type_add_transformer._max_new_args", 1
+        ), self.assertRaisesRegex(
+            ValueError, r"Calls of X1\.method pass at least 1 arguments"
+        ):
+            self._get_protocols("def foo(x):\n    x.method(1, 2)\n")
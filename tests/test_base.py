@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 from protocolist.config import Config
@@ -15,8 +16,12 @@ class TestBase(TestCase):
     def setUp(self):
         self.protocol_file_name = "protocols.py"
         self.protocols_path = self.before / self.protocol_file_name
+        mypy_folder = TemporaryDirectory()
+        self.addCleanup(mypy_folder.cleanup)
+        self.mypy_folder = Path(mypy_folder.name)
 
     def _test(self, after: Path, config: Config):
+        config.mypy_folder = self.mypy_folder
         before_update_files = tuple(
             (filepath, filepath.read_text())
             for filepath in self.before.iterdir()
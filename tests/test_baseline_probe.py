@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from protocolist.config import Config
+from protocolist.get_mypy_exceptions import get_many_mypy_exceptions
+from protocolist.get_mypy_exceptions import get_mypy_exceptions
+from protocolist.main import protocol
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+
+
+class TestBaselineProbe(TestCase):
+    code = "def foo(x, y):\n    print(y.upper())\n    return open(x)\n"
+
+    def _get_annotated_code(self, get_many) -> tuple[tuple[str, ...], int]:
+        with TemporaryDirectory(
+            dir="tests"
+        ) as folder, TemporaryDirectory() as mypy_folder:
+            filepath = Path(folder) / "test.py"
+            protocols_path = Path(folder) / "protocols.py"
+            filepath.write_text(self.code)
+            protocols_path.write_text("")
+            with patch(
+                "protocolist.transform.type_add_transformer."
+                "get_many_mypy_exceptions",
+                side_effect=get_many,
+            ) as mocked:
+                protocol(
+                    Config(
+                        pos_args=[str(filepath)],
+                        interfaces_path=str(protocols_path),
+                        mypy_folder=mypy_folder,
+                        protocol_presentation=(
+                            PresentationOption.PARTIAL_PROTOCOLS
+                        ),
+                        function_memo=False,
+                        persistent_probe_cache=False,
+                        probe_cache_size=0,
+                    )
+                )
+            return tuple(
+                path.read_text().replace(Path(folder).name, "folder")
+                for path in (filepath, protocols_path)
+            ), sum(len(call.args[1]) == 2 for call in mocked.call_args_list)
+
+    def test_batched_baseline_matches_separate_probes(self):
+        batched, n_pairs = self._get_annotated_code(get_many_mypy_exceptions)
+        self.assertLess(0, n_pairs)
+        self.assertIn("x: Union[PathLike[bytes], PathLike[str]", batched[0])
+        separate, _ = self._get_annotated_code(
+            lambda config, codes, strict=True: [
+                get_mypy_exceptions(config, code, strict) for code in codes
+            ]
+        )
+        self.assertEqual(batched, separate)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from protocolist.checker.checker_factory import get_checker
+from protocolist.checker.checker_option import CheckerOption
+from protocolist.config import Config
+
+
+class TestChecker(TestCase):
+    codes = (
+        "x: int = 'a'\n",
+        "y: str = 'a'\n",
+        "def foo(arg: None) -> None:\n    arg + 1\n",
+    )
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_config(self, checker_option: CheckerOption) -> Config:
+        return Config(
+            mypy_folder=self.root,
+            interfaces_path=str(self.root / "interfaces" / "interfaces.py"),
+            checker_option=checker_option,
+            persistent_probe_cache=False,
+        )
+
+    def test_check_many_matches_check(self):
+        for checker_option in CheckerOption:
+            checker = get_checker(self.get_config(checker_option))
+            self.addCleanup(checker.close)
+            with self.subTest(checker_option=checker_option):
+                self.assertEqual(
+                    list(map(checker.check, self.codes)),
+                    checker.check_many(self.codes),
+                )
+
+    def test_exceptions_are_indexed_by_code(self):
+        for checker_option in CheckerOption:
+            checker = get_checker(self.get_config(checker_option))
+            self.addCleanup(checker.close)
+            with self.subTest(checker_option=checker_option):
+                (exception,) = checker.check(self.codes[2]).get("operator")
+                self.assertEqual(2, exception.line)
+                self.assertEqual(("None", "int"), exception.types)
+                (exception,) = checker.check("def foo(:\n").get("syntax")
+                self.assertEqual(1, exception.line)
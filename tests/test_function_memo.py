@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+import libcst
+from protocolist.config import Config
+from protocolist.main import protocol
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+from protocolist.protocol_dict import ProtocolDict
+from protocolist.transform.function_memo import FunctionMemo
+from protocolist.transform.function_memo import reserve_names
+
+
+class TestFunctionMemo(TestCase):
+    def setUp(self):
+        self.before = Path("tests/file_sets/math/before_update")
+        self.protocols_path = self.before / "protocols.py"
+        self.contents = tuple(
+            (filepath, filepath.read_text())
+            for filepath in self.before.iterdir()
+        )
+        mypy_folder = TemporaryDirectory()
+        self.addCleanup(mypy_folder.cleanup)
+        self.config = Config(
+            pos_args=tuple(map(str, self.before.iterdir())),
+            interfaces_path=str(self.protocols_path),
+            mypy_folder=mypy_folder.name,
+            add_protocols_on_builtin=True,
+            protocol_presentation=PresentationOption.PARTIAL_PROTOCOLS,
+            incremental=False,
+        )
+
+    def tearDown(self):
+        self._restore()
+        self.protocols_path.unlink(missing_ok=True)
+
+    def _restore(self):
+        for filepath, content in self.contents:
+            filepath.write_text(content)
+        self.protocols_path.write_text("")
+
+    def _read(self) -> tuple[str, ...]:
+        return tuple(
+            filepath.read_text() for filepath in sorted(self.before.iterdir())
+        )
+
+    def test_unchanged_functions_are_not_probed(self):
+        self._restore()
+        protocol(self.config)
+        expected = self._read()
+        self._restore()
+        with patch(
+            "protocolist.transform.type_add_transformer.get_mypy_exceptions",
+            side_effect=AssertionError,
+        ):
+            protocol(self.config)
+        self.assertEqual(expected, self._read())
+
+    def test_names_are_moved_to_reserved_ones(self):
+        record = dict(
+            placeholders=dict(arg="Arg3"),
+            counters=dict(Append=(4, 2)),
+        )
+        protocols = ProtocolDict(int, Arg=7, Append=1)
+        rename = reserve_names(record, dict(arg="Arg7"), protocols)
+        self.assertEqual(3, protocols["Append"])
+        self.assertEqual(
+            "Union[Arg7, Append2, Append3, Arg30, Append1]",
+            rename("Union[Arg3, Append5, Append6, Arg30, Append1]"),
+        )
+
+    def test_key_depends_on_protocolist_sources(self):
+        code = "def foo(x):\n    x.method(1)\n"
+        function = libcst.parse_statement(code)
+        key = FunctionMemo(self.config).get_key(function, None, (), code)
+        with patch(
+            "protocolist.get_config_fingerprint.get_source_digest",
+            return_value="edited",
+        ):
+            self.assertNotEqual(
+                key,
+                FunctionMemo(self.config).get_key(function, None, (), code),
+            )
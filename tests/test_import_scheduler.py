@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+from unittest import TestCase
+
+from protocolist.import_scheduler import ImportScheduler
+
+
+class TestImportScheduler(TestCase):
+    paths = tuple(Path(f"/project/module{index}.py") for index in range(5))
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(4)
+        self.addCleanup(self.executor.shutdown)
+        self.lock = Lock()
+        self.events = []
+
+    def _run(
+        self, batches, dependents, failing: Optional[Path] = None
+    ) -> dict[Path, int]:
+        def start(path: Path) -> Optional[int]:
+            self._log("start", path)
+            if path == self.paths[4]:
+                self._log("finish", path)
+                return 0
+            self.executor.submit(work, path)
+            return None
+
+        def work(path: Path) -> None:
+            time.sleep(0.01)
+            if path == failing:
+                scheduler.fail(ValueError(path))
+                return
+            self._log("finish", path)
+            scheduler.complete(path, 1)
+
+        scheduler = ImportScheduler(batches, dependents, start)
+        return scheduler.run()
+
+    def _log(self, event: str, path: Path) -> None:
+        with self.lock:
+            self.events.append((event, path))
+
+    def test_dependents_start_after_their_imports(self):
+        batches = tuple((path,) for path in self.paths[:4])
+        results = self._run(batches, {0: {1, 2}, 1: {3}, 2: {3}})
+        self.assertEqual(dict.fromkeys(self.paths[:4], 1), results)
+        for imported, importing in ((0, 1), (0, 2), (1, 3), (2, 3)):
+            self.assertLess(
+                self.events.index(("finish", self.paths[imported])),
+                self.events.index(("start", self.paths[importing])),
+            )
+
+    def test_cyclic_batches_make_progress(self):
+        batches = (self.paths[:2], self.paths[2:4], (self.paths[4],))
+        results = self._run(batches, {0: {1}, 2: {1}})
+        self.assertEqual(
+            {**dict.fromkeys(self.paths[:4], 1), self.paths[4]: 0}, results
+        )
+        self.assertLess(
+            max(
+                self.events.index(("finish", path))
+                for path in (*self.paths[:2], self.paths[4])
+            ),
+            min(
+                self.events.index(("start", path)) for path in self.paths[2:4]
+            ),
+        )
+
+    def test_worker_errors_propagate(self):
+        batches = tuple((path,) for path in self.paths[:2])
+        with self.assertRaises(ValueError):
+            self._run(batches, {0: {1}}, failing=self.paths[0])
+        self.assertNotIn(("start", self.paths[1]), self.events)
+
+    def test_release_errors_propagate(self):
+        def start(path: Path) -> Optional[int]:
+            if path == self.paths[1]:
+                raise ValueError(path)
+            self.executor.submit(scheduler.complete, path, 1)
+            return None
+
+        scheduler = ImportScheduler(
+            tuple((path,) for path in self.paths[:2]), {0: {1}}, start
+        )
+        with self.assertRaises(ValueError):
+            scheduler.run()
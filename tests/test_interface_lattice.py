@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from itertools import combinations
+from unittest import TestCase
+
+from protocolist.consts import abc_classes
+from protocolist.consts import builtin_types
+from protocolist.interface_lattice import interface_lattice
+
+interfaces = abc_classes + builtin_types
+
+
+class TestInterfaceLattice(TestCase):
+    def test_providers_match_the_tables(self):
+        for methods in (
+            [],
+            ["__iter__"],
+            ["__iter__", "__len__"],
+            ["__getitem__", "keys"],
+            ["__add__", "unknown"],
+        ):
+            with self.subTest(methods=methods):
+                self.assertEqual(
+                    interface_lattice.get_names(
+                        interface_lattice.get_providers(methods)
+                    ),
+                    tuple(
+                        name
+                        for name, _, interface_methods in interfaces
+                        if all(map(interface_methods.__contains__, methods))
+                    ),
+                )
+
+    def test_most_specific_keeps_declared_superclasses(self):
+        names = ("Iterable", "Sequence", "int", "SupportsIndex", "Other")
+        for subset in combinations(names, 3):
+            with self.subTest(subset=subset):
+                self.assertEqual(
+                    interface_lattice.get_names(
+                        interface_lattice.get_most_specific(
+                            interface_lattice.get_mask(subset)
+                        )
+                    ),
+                    tuple(
+                        name
+                        for name, superclasses, _ in interfaces
+                        if name in subset
+                        and not any(map(subset.__contains__, superclasses))
+                    ),
+                )
+
+    def test_implemented_interfaces_of_fields(self):
+        implemented = interface_lattice.get_implemented(dir(list))
+        self.assertIn("list", interface_lattice.get_names(implemented))
+        self.assertIn(
+            "Sequence",
+            interface_lattice.get_names(
+                interface_lattice.get_superclasses(implemented)
+            ),
+        )
+        self.assertTrue(
+            interface_lattice.has_superclasses("int", ["Hashable"])
+        )
+        self.assertFalse(interface_lattice.has_superclasses("int", ["Other"]))
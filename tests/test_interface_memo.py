@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from protocolist.config import Config
+from protocolist.run_statistics import run_statistics
+from protocolist.transform.interface_memo import InterfaceMemo
+
+
+class TestInterfaceMemo(TestCase):
+    def test_usage_is_enumerated_once(self):
+        memo = InterfaceMemo(Config(external_libraries=()))
+        run_statistics.collect()
+        candidates = memo.get(["__iter__", "__len__"], {"str"})
+        self.assertIn("Collection", candidates[0])
+        self.assertNotIn("Iterable", candidates[0])
+        self.assertIs(memo.get(("__len__", "__iter__"), ["str"]), candidates)
+        self.assertEqual(
+            run_statistics.collect(),
+            {"interface_memo.miss": 1, "interface_memo.hit": 1},
+        )
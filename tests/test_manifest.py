@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from protocolist.config import Config
+from protocolist.main import protocol
+from protocolist.manifest import Manifest
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+from protocolist.transform.class_extractor import ClassExtractor
+
+
+class TestManifest(TestCase):
+    def setUp(self):
+        self.before = Path("tests/file_sets/math/before_update")
+        self.protocols_path = self.before / "protocols.py"
+        self.contents = tuple(
+            (filepath, filepath.read_text())
+            for filepath in self.before.iterdir()
+        )
+        mypy_folder = TemporaryDirectory()
+        self.addCleanup(mypy_folder.cleanup)
+        self.config = Config(
+            pos_args=tuple(map(str, self.before.iterdir())),
+            interfaces_path=str(self.protocols_path),
+            mypy_folder=mypy_folder.name,
+            add_protocols_on_builtin=True,
+            protocol_presentation=PresentationOption.PARTIAL_PROTOCOLS,
+            incremental=True,
+        )
+
+    def tearDown(self):
+        for filepath, content in self.contents:
+            filepath.write_text(content)
+        self.protocols_path.unlink(missing_ok=True)
+
+    def test_unchanged_files_restore_their_protocols(self):
+        protocol(self.config)
+        protocols = self.protocols_path.read_text()
+        self.protocols_path.write_text("")
+        with patch(
+            "protocolist.main.create_protocols", side_effect=AssertionError
+        ):
+            protocol(self.config)
+        self.assertEqual(
+            ClassExtractor(self.config).extract_protocols(protocols),
+            ClassExtractor(self.config).extract_protocols(
+                self.protocols_path.read_text()
+            ),
+        )
+
+    def test_protocols_of_multiline_imports_are_found(self):
+        import_path = self.config.interface_import_path
+        self.assertEqual(
+            {"Add1", "Sub1", "Mul1"},
+            Manifest(self.config)._get_protocol_names(
+                f"from {import_path} import (\n"
+                "    Add1,\n"
+                "    Sub1 as Subtract,\n"
+                ")\n"
+                f"from {import_path} import Mul1\n",
+                dict(
+                    Add1="class Add1(Protocol): ...",
+                    Sub1="class Sub1(Protocol): ...",
+                    Mul1="class Mul1(Protocol): ...",
+                    Div1="class Div1(Protocol): ...",
+                ),
+            ),
+        )
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from protocolist.utils.multi_replacer import MultiReplacer
+
+
+class TestMultiReplacer(TestCase):
+    def test_longest_keys_win(self):
+        replacer = MultiReplacer(prefix=": ")
+        replacer["Arg1"] = "int"
+        self.assertEqual(
+            "x: int, y: int2", replacer.replace("x: Arg1, y: Arg12")
+        )
+        replacer["Arg12"] = "str"
+        self.assertEqual(
+            "x: int, y: str", replacer.replace("x: Arg1, y: Arg12")
+        )
+
+    def test_replacements_are_not_chained(self):
+        replacer = MultiReplacer()
+        replacer.update(a="b", b="c")
+        self.assertEqual("bc", replacer.replace("ab"))
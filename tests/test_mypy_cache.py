@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from protocolist.checker.checker_factory import get_checker
+from protocolist.checker.mypy_cache import get_overlay_cache_dir
+from protocolist.checker.mypy_cache import get_shared_cache_dir
+from protocolist.config import Config
+
+
+class TestMypyCache(TestCase):
+    def test_overlays_start_from_the_warm_cache(self):
+        with TemporaryDirectory() as mypy_folder:
+            config = Config(
+                interfaces_path=f"{mypy_folder}/interfaces.py",
+                mypy_folder=mypy_folder,
+            )
+            checker = get_checker(config)
+            checker.warm_up()
+            shared = get_shared_cache_dir(config, True)
+            shared_files = frozenset(
+                path.relative_to(shared) for path in shared.rglob("*")
+            )
+            self.assertTrue(shared_files)
+            overlay = get_overlay_cache_dir(config, True)
+            self.assertLessEqual(
+                shared_files,
+                frozenset(
+                    path.relative_to(overlay) for path in overlay.rglob("*")
+                ),
+            )
+            self.assertNotEqual(
+                overlay, get_overlay_cache_dir(config, True, 1)
+            )
+            checker.check("x: int = 1\n")
+            self.assertEqual(
+                shared_files,
+                frozenset(
+                    path.relative_to(shared) for path in shared.rglob("*")
+                ),
+            )
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from protocolist.config import Config
+from protocolist.main import protocol
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+
+
+class TestNestedLiterals(TestCase):
+    code = "def foo(x, y):\n    y.a.b()\n    x.a.c.d()\n    x.e.a.f(1)\n"
+
+    def test_fields_are_numbered_in_scan_order(self):
+        with TemporaryDirectory(
+            dir="tests"
+        ) as folder, TemporaryDirectory() as mypy_folder:
+            filepath = Path(folder) / "test.py"
+            protocols_path = Path(folder) / "protocols.py"
+            filepath.write_text(self.code)
+            protocols_path.write_text("")
+            protocol(
+                Config(
+                    pos_args=[str(filepath)],
+                    interfaces_path=str(protocols_path),
+                    mypy_folder=mypy_folder,
+                    protocol_presentation=(
+                        PresentationOption.PARTIAL_PROTOCOLS
+                    ),
+                    function_memo=False,
+                    persistent_probe_cache=False,
+                )
+            )
+            self.assertIn("def foo(x: X1, y: Y1):", filepath.read_text())
+            protocols = protocols_path.read_text()
+        for class_code in (
+            "class X1(ProtocolistProtocol):\n\ta: A1\n\te: E1\n",
+            "class Y1(ProtocolistProtocol):\n\ta: A2\n",
+            "class E1(ProtocolistProtocol):\n\ta: A3\n",
+            "class A1(ProtocolistProtocol):\n\tc: C1\n",
+            "class A2(ProtocolistProtocol):\n\tdef b(self):\n",
+            "class A3(ProtocolistProtocol):\n\tdef f(self, arg0: int):\n",
+            "class C1(ProtocolistProtocol):\n\tdef d(self):\n",
+        ):
+            with self.subTest(class_code=class_code):
+                self.assertIn(class_code, protocols)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from protocolist.checker.checker_option import CheckerOption
+from protocolist.checker.checkers.pool_checker import PoolChecker
+from protocolist.config import Config
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+from protocolist.protocol_markers.mark_options import MarkOption
+
+from tests.test_base import TestBase
+
+
+class TestPoolChecker(TestBase):
+    def setUp(self):
+        self.base = Path("tests/file_sets/recursive_type")
+        self.before = self.base / Path("before_update")
+        super().setUp()
+
+    def test(self):
+        after = self.base / Path("after_update")
+        config = Config(
+            pos_args=tuple(
+                map(
+                    str,
+                    self.before.iterdir(),
+                )
+            ),
+            interfaces_path=str(self.protocols_path),
+            add_protocols_on_builtin=True,
+            mark_option=MarkOption.ALL,
+            protocol_presentation=PresentationOption.PARTIAL_PROTOCOLS,
+            checker_option=CheckerOption.POOL,
+        )
+        self._test(after, config)
+
+    def test_single_probe_is_checked_in_process(self):
+        with TemporaryDirectory() as folder:
+            checker = PoolChecker(
+                Config(
+                    mypy_folder=folder,
+                    interfaces_path=f"{folder}/interfaces/interfaces.py",
+                    checker_option=CheckerOption.POOL,
+                    shared_mypy_cache=False,
+                )
+            )
+            with patch(
+                "protocolist.checker.checkers.pool_checker.subprocess.run",
+                side_effect=AssertionError,
+            ):
+                (exception,) = checker.check("x: int = 'a'\n").get(
+                    "assignment"
+                )
+        self.assertEqual(1, exception.line)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import io
+import re
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from protocolist.config import Config
+from protocolist.main import protocol
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+
+
+class TestPrefetchProtocols(TestCase):
+    def setUp(self):
+        self.before = Path("tests/file_sets/general_set/before_update")
+        self.filepath = self.before / "test_classes.py"
+        self.protocols_path = self.before / "protocols.py"
+        self.content = self.filepath.read_text()
+
+    def tearDown(self):
+        self.filepath.write_text(self.content)
+        self.protocols_path.unlink(missing_ok=True)
+
+    def _run(self, n_workers: int) -> tuple[tuple[str, str], str]:
+        self.filepath.write_text(self.content)
+        self.protocols_path.write_text("")
+        with TemporaryDirectory() as mypy_folder:
+            output = io.StringIO()
+            with redirect_stdout(output):
+                protocol(
+                    Config(
+                        pos_args=[str(self.filepath)],
+                        interfaces_path=str(self.protocols_path),
+                        mypy_folder=mypy_folder,
+                        add_protocols_on_builtin=True,
+                        protocol_presentation=(
+                            PresentationOption.PARTIAL_PROTOCOLS
+                        ),
+                        incremental=False,
+                        n_workers=n_workers,
+                    )
+                )
+        return (
+            self.filepath.read_text(),
+            self.protocols_path.read_text(),
+        ), output.getvalue()
+
+    def test_parallel_run_matches_serial_one(self):
+        serial, _ = self._run(1)
+        parallel, output = self._run(2)
+        self.assertEqual(serial, parallel)
+        self.assertRegex(output, re.compile(r"function_memo: [1-9]"))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from protocolist.checker.mypy_exception import MypyException
+from protocolist.checker.probe_cache import ProbeCache
+from protocolist.config import Config
+
+
+class TestProbeCache(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.origin_path = os.getcwd()
+        os.chdir(self.root)
+        self.config = Config(
+            mypy_folder=self.root,
+            interfaces_path=str(self.root / "interfaces" / "interfaces.py"),
+            probe_cache_size=1,
+        )
+
+    def tearDown(self):
+        os.chdir(self.origin_path)
+        self.temp_dir.cleanup()
+
+    def test_dependency_change_invalidates_key(self):
+        dependency = self.root / "dependency.py"
+        dependency.write_text("x = 1\n")
+        code = "from dependency import x\n"
+        probe_cache = ProbeCache(self.config)
+        key = probe_cache.get_key(code, True)
+        dependency.write_text("x = '1'\n")
+        self.assertNotEqual(key, probe_cache.get_key(code, True))
+
+    def test_disk_tier_outlives_memory(self):
+        first = MypyException(1, "error", "first", "misc")
+        second = MypyException(1, "error", "second", "misc")
+        probe_cache = ProbeCache(self.config)
+        probe_cache.set("first", [first])
+        probe_cache.set("second", [second])
+        self.assertEqual((first,), probe_cache.get("first"))
+        self.assertIsNone(probe_cache.get("third"))
+        self.assertEqual((second,), ProbeCache(self.config).get("second"))
+
+    def test_default_folder_is_under_project_root(self):
+        config = Config(
+            project_root=self.root,
+            interfaces_path=str(self.root / "interfaces" / "interfaces.py"),
+        )
+        self.assertEqual(self.root / ".protocolist", config.mypy_folder)
+        self.assertTrue(config.mypy_folder.is_dir())
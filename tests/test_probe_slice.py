@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from protocolist.transform.probe_slice import slice_probe_context
+
+_code = """import os
+
+LIMIT = 3
+UNUSED = 4
+
+
+def helper(value: int) -> int:
+    return value + LIMIT
+
+
+def caller():
+    return foo(helper(1))
+
+
+def unrelated():
+    return os.sep
+
+
+unrelated()
+"""
+
+
+class TestProbeSlice(TestCase):
+    def test_slice_keeps_callers_and_referenced_signatures(self):
+        self.assertEqual(
+            """import os
+
+
+def helper(value: int) -> int:
+    ...
+
+
+def caller():
+    return foo(helper(1))
+""",
+            slice_probe_context(
+                _code, "def foo(arg: Literal['Arg1']):\n    ...\n", "foo"
+            ),
+        )
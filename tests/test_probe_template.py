@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from protocolist.transform.probe_template import ProbeTemplate
+
+
+class TestProbeTemplate(TestCase):
+    def test_every_occurrence_is_rendered(self):
+        template = ProbeTemplate(
+            "def f(a: Literal['Arg1'], b: Literal['Arg1']): ...",
+            "Literal['Arg1']",
+        )
+        self.assertEqual("def f(a: int, b: int): ...", template.render("int"))
+        self.assertEqual(
+            "def f(a: None, b: None): ...", template.render("None")
+        )
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest import TestCase
+
+from protocolist.sort_paths_by_import_links import _ImportLink
+from protocolist.sort_paths_by_import_links import (
+    batch_paths_by_import_links,
+)
+from protocolist.sort_paths_by_import_links import (
+    sort_paths_by_import_links,
+)
+
+
+class TestSortPathsByImportLinks(TestCase):
+    paths = tuple(Path(f"/project/module{index}.py") for index in range(5))
+
+    def test_imported_files_come_first(self):
+        import_links = (
+            _ImportLink(self.paths[3], self.paths[0]),
+            _ImportLink(self.paths[4], self.paths[3]),
+        )
+        self.assertEqual(
+            [self.paths[1], self.paths[2], self.paths[4], self.paths[3]]
+            + [self.paths[0]],
+            sort_paths_by_import_links(self.paths, import_links),
+        )
+
+    def test_cycles_are_batched(self):
+        import_links = (
+            _ImportLink(self.paths[1], self.paths[2]),
+            _ImportLink(self.paths[2], self.paths[1]),
+            _ImportLink(self.paths[2], self.paths[0]),
+        )
+        self.assertEqual(
+            [
+                (self.paths[1], self.paths[2]),
+                (self.paths[0],),
+                (self.paths[3],),
+                (self.paths[4],),
+            ],
+            batch_paths_by_import_links(self.paths, import_links),
+        )
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from protocolist.config import Config
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+from protocolist.protocol_markers.mark_options import MarkOption
+
+from tests.test_base import TestBase
+
+
+class TestStubSnapshot(TestBase):
+    def setUp(self):
+        self.base = Path("tests/file_sets/recursive_type")
+        self.before = self.base / Path("before_update")
+        super().setUp()
+
+    def test(self):
+        after = self.base / Path("after_update")
+        config = Config(
+            pos_args=tuple(
+                map(
+                    str,
+                    self.before.iterdir(),
+                )
+            ),
+            interfaces_path=str(self.protocols_path),
+            add_protocols_on_builtin=True,
+            mark_option=MarkOption.ALL,
+            protocol_presentation=PresentationOption.PARTIAL_PROTOCOLS,
+            stub_snapshot=True,
+        )
+        mypy_path = os.environ.get("MYPYPATH")
+        self._test(after, config)
+        self.assertEqual(mypy_path, os.environ.get("MYPYPATH"))
+        self.assertTrue(
+            config.mypy_folder.joinpath(
+                "stubs", self.before, "imported.pyi"
+            ).exists()
+        )
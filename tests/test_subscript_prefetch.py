@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from protocolist.config import Config
+from protocolist.main import protocol
+from protocolist.presentation_option.presentation_option import (
+    PresentationOption,
+)
+
+
+class TestSubscriptPrefetch(TestCase):
+    code = (
+        "def foo(x):\n    for a in x:\n        print(a + 1)\n    return x[0]\n"
+    )
+
+    def _get_annotated_code(self, probe_cache_size: int) -> str:
+        with TemporaryDirectory(dir="tests") as folder:
+            filepath = Path(folder) / "test.py"
+            protocols_path = Path(folder) / "protocols.py"
+            filepath.write_text(self.code)
+            protocols_path.write_text("")
+            protocol(
+                Config(
+                    pos_args=[str(filepath)],
+                    interfaces_path=str(protocols_path),
+                    mypy_folder=folder,
+                    protocol_presentation=(
+                        PresentationOption.PARTIAL_PROTOCOLS
+                    ),
+                    incremental=False,
+                    function_memo=False,
+                    persistent_probe_cache=False,
+                    probe_cache_size=probe_cache_size,
+                )
+            )
+            return filepath.read_text()
+
+    def test_prefetched_subscripts_are_inferred_as_before(self):
+        prefetched = self._get_annotated_code(4096)
+        self.assertIn(
+            "Mapping[Union[complex, float, int], Any], "
+            "Sequence[Union[complex, float, int]]",
+            prefetched,
+        )
+        self.assertEqual(prefetched, self._get_annotated_code(0))
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from protocolist.transform.usage_collector import get_parameter_usage
+from protocolist.transform.usage_collector import ParameterUsage
+
+
+class TestUsageCollector(TestCase):
+    annotation = "Literal['Arg1']"
+
+    def test_known_usages(self):
+        code = (
+            "def foo(arg: Literal['Arg1'], other: int) -> None:\n"
+            "    arg.append(other)\n"
+            "    print(arg[0] + len(arg))\n"
+            "    arg[1] = arg - 1\n"
+            "    for item in arg:\n"
+            "        print(item)\n"
+        )
+        self.assertEqual(
+            ParameterUsage(
+                frozenset(
+                    (
+                        "append",
+                        "__getitem__",
+                        "__len__",
+                        "__setitem__",
+                        "__sub__",
+                        "__iter__",
+                    )
+                ),
+                frozenset(("Sized",)),
+            ),
+            get_parameter_usage(code, self.annotation),
+        )
+
+    def test_subscript_statements(self):
+        for body, methods in (
+            ("del arg[0]", ("__delitem__",)),
+            ("arg[0] += 1", ("__getitem__", "__setitem__")),
+        ):
+            with self.subTest(body=body):
+                self.assertEqual(
+                    ParameterUsage(frozenset(methods), frozenset()),
+                    get_parameter_usage(
+                        f"def foo(arg: Literal['Arg1']):\n    {body}\n",
+                        self.annotation,
+                    ),
+                )
+
+    def test_unknown_usages(self):
+        for body in (
+            "return arg",
+            "print(arg)",
+            "arg += 1",
+            "if arg:\n        pass",
+            "print(1 + arg)",
+            "print(1 in arg)",
+            "arg[0], other = 1, 2",
+        ):
+            with self.subTest(body=body):
+                self.assertIsNone(
+                    get_parameter_usage(
+                        f"def foo(arg: Literal['Arg1']):\n    {body}\n",
+                        self.annotation,
+                    )
+                )
+
+    def test_annotation_outside_parameters(self):
+        self.assertIsNone(
+            get_parameter_usage(
+                "def foo(arg: Literal['Arg1']) -> list[Literal['Arg1']]:\n"
+                "    arg.append(1)\n",
+                self.annotation,
+            )
+        )